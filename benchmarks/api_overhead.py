@@ -0,0 +1,96 @@
+import click
+import os
+import subprocess
+import sys
+import tempfile
+
+from image_codec.api import decode_bytes, decode_file, encode_array, encode_file
+from image_codec.pgm import write_pgm
+
+from .common import best_time, load_image
+
+
+@click.command()
+@click.option("-i", "--input-path", type=click.Path(exists=True))
+@click.option("-W", "--width", default=256, show_default=True)
+@click.option("-H", "--height", default=256, show_default=True)
+@click.option("-bs", "--block-size", default=16, show_default=True)
+@click.option("-qp", "--quality-parameter", default=12, show_default=True)
+@click.option("--preset", default="ultrafast", show_default=True)
+@click.option("-n", "--repeats", default=5, show_default=True)
+def main(input_path, width, height, block_size, quality_parameter, preset, repeats):
+    """Measure per-request overhead of the in-memory API, files and the CLI."""
+    image = load_image(input_path, width, height)
+    options = dict(preset=preset)
+
+    with tempfile.TemporaryDirectory() as directory:
+        image_path = os.path.join(directory, "image.pgm")
+        bitstream_path = os.path.join(directory, "image.bin")
+        decoded_path = os.path.join(directory, "decoded.pgm")
+        write_pgm(image_path, image)
+        data = encode_array(image, block_size, quality_parameter, **options)
+        with open(bitstream_path, "wb") as file:
+            file.write(data)
+
+        command = [sys.executable, "-m", "image_codec"]
+        requests = {
+            "in-memory": (
+                lambda: encode_array(image, block_size, quality_parameter, **options),
+                lambda: decode_bytes(data),
+            ),
+            "files": (
+                lambda: encode_file(
+                    image_path,
+                    bitstream_path,
+                    block_size,
+                    quality_parameter,
+                    show_progress=False,
+                    **options,
+                ),
+                lambda: decode_file(bitstream_path, decoded_path),
+            ),
+            "CLI process": (
+                lambda: subprocess.run(
+                    command
+                    + [
+                        "encode",
+                        image_path,
+                        bitstream_path,
+                        "-bs",
+                        str(block_size),
+                        "-qp",
+                        str(quality_parameter),
+                        "--preset",
+                        preset,
+                        "--no-progress",
+                    ],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                ),
+                lambda: subprocess.run(
+                    command + ["decode", bitstream_path, decoded_path],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                ),
+            ),
+        }
+
+        print(f"{image.shape[1]}x{image.shape[0]} image, preset {preset}")
+        base_times = None
+        for name, functions in requests.items():
+            elapsed_times = [best_time(function, repeats)[0] for function in functions]
+            base_times = base_times or elapsed_times
+            print(
+                f"{name:>12}: "
+                + ", ".join(
+                    f"{action} {elapsed_time * 1000:.1f} ms "
+                    f"(+{(elapsed_time - base_time) * 1000:.1f} ms)"
+                    for action, elapsed_time, base_time in zip(
+                        ["encode", "decode"], elapsed_times, base_times
+                    )
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import numpy as np
+import time
+
+from typing import Callable, Sequence, Tuple
+
+
+def synthetic_image(width: int, height: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    image = (
+        128
+        + 50 * np.sin(x / 23) * np.cos(y / 17)
+        + 30 * ((x // 64 + y // 48) % 2)
+        + rng.normal(0, 4, [height, width])
+    )
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def load_image(input_path: str, width: int, height: int) -> np.ndarray:
+    if input_path is None:
+        return synthetic_image(width, height)
+
+    from image_codec.pgm import read_pgm
+
+    return read_pgm(input_path)[0]
+
+
+def best_time(function: Callable, n_repeats: int) -> Tuple[float, object]:
+    best_elapsed_time = float("inf")
+    for _ in range(n_repeats):
+        start_time = time.perf_counter()
+        result = function()
+        best_elapsed_time = min(best_elapsed_time, time.perf_counter() - start_time)
+    return best_elapsed_time, result
+
+
+def psnr(image: np.ndarray, reconstruction: np.ndarray) -> float:
+    mse = np.mean((image.astype(np.float64) - reconstruction) ** 2)
+    return 10 * np.log10(255**2 / mse) if mse else float("inf")
+
+
+def bd_rate(
+    reference_rates: Sequence[float],
+    reference_psnrs: Sequence[float],
+    rates: Sequence[float],
+    psnrs: Sequence[float],
+) -> float:
+    reference_fit = np.polyfit(reference_psnrs, np.log(reference_rates), 3)
+    fit = np.polyfit(psnrs, np.log(rates), 3)
+    low = max(min(reference_psnrs), min(psnrs))
+    high = min(max(reference_psnrs), max(psnrs))
+
+    reference_integral = np.polyval(np.polyint(reference_fit), [low, high])
+    integral = np.polyval(np.polyint(fit), [low, high])
+    mean_difference = (
+        (integral[1] - integral[0]) - (reference_integral[1] - reference_integral[0])
+    ) / (high - low)
+    return np.exp(mean_difference) - 1
@@ -0,0 +1,69 @@
+import click
+import os
+import tempfile
+
+from image_codec.api import decode_file, encode_array
+
+from .common import best_time, load_image
+
+
+@click.command()
+@click.option("-i", "--input-path", type=click.Path(exists=True))
+@click.option("-W", "--width", default=1536, show_default=True)
+@click.option("-H", "--height", default=1152, show_default=True)
+@click.option("-bs", "--block-size", default=16, show_default=True)
+@click.option("-qp", "--quality-parameter", default=12, show_default=True)
+@click.option("-tc", "--tile-columns", default=4, show_default=True)
+@click.option("-tr", "--tile-rows", default=4, show_default=True)
+@click.option("-j", "--jobs", default="1,2,4,8", show_default=True)
+@click.option("-n", "--repeats", default=3, show_default=True)
+def main(
+    input_path,
+    width,
+    height,
+    block_size,
+    quality_parameter,
+    tile_columns,
+    tile_rows,
+    jobs,
+    repeats,
+):
+    """Measure decoder scaling with the number of worker processes."""
+    image = load_image(input_path, width, height)
+    layouts = {
+        f"{tile_columns}x{tile_rows} tiles": dict(
+            n_tile_columns=tile_columns, n_tile_rows=tile_rows
+        ),
+        "wavefront": dict(wavefront=True),
+    }
+
+    print(f"{os.cpu_count()} CPUs, {image.shape[1]}x{image.shape[0]} image")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, layout in layouts.items():
+            input_path = os.path.join(directory, "image.bin")
+            with open(input_path, "wb") as file:
+                file.write(
+                    encode_array(
+                        image,
+                        block_size,
+                        quality_parameter,
+                        preset="ultrafast",
+                        **layout,
+                    )
+                )
+
+            base_time = None
+            for n_jobs in [int(n_jobs) for n_jobs in jobs.split(",")]:
+                elapsed_time, _ = best_time(
+                    lambda: decode_file(input_path, None, n_jobs=n_jobs), repeats
+                )
+                base_time = base_time or elapsed_time
+                print(
+                    f"{name:>12} jobs={n_jobs}: {elapsed_time * 1000:.0f} ms, "
+                    f"{image.size / 1e6 / elapsed_time:.2f} MP/s, "
+                    f"speedup {base_time / elapsed_time:.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
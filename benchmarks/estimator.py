@@ -0,0 +1,97 @@
+import click
+import numpy as np
+import time
+
+from typing import List, Tuple
+
+from image_codec.api import encode_array
+from image_codec.encoders.entropy import EntropyEncoder
+from image_codec.modes import EstimationMode
+from image_codec.parameters import PartitioningModeParameters
+
+from .common import load_image
+
+
+def record_coded_blocks(
+    image: np.ndarray, block_size: int, quality_parameter: int
+) -> List[PartitioningModeParameters]:
+    coded_blocks = []
+    encode_block = EntropyEncoder.encode_block
+
+    def record_block(entropy_encoder, parameters):
+        coded_blocks.append(parameters)
+        encode_block(entropy_encoder, parameters)
+
+    EntropyEncoder.encode_block = record_block
+    try:
+        encode_array(image, block_size, quality_parameter, preset="ultrafast")
+    finally:
+        EntropyEncoder.encode_block = encode_block
+    return coded_blocks
+
+
+def estimate_blocks(
+    coded_blocks: List[PartitioningModeParameters],
+    block_size: int,
+    estimation_mode: EstimationMode,
+    n_repeats: int,
+) -> Tuple[np.ndarray, float]:
+    entropy_encoder = EntropyEncoder(None, block_size, estimation_mode)
+    estimations = []
+    elapsed_time = 0
+    for parameters in coded_blocks:
+        for index, prediction_mode_parameters in enumerate(
+            parameters.prediction_mode_parameters_list
+        ):
+            start_time = time.perf_counter()
+            for _ in range(n_repeats):
+                n_bits = entropy_encoder.estimate_block_bits(
+                    prediction_mode_parameters.block,
+                    parameters.partitioning_mode,
+                    prediction_mode_parameters.prediction_mode,
+                    is_first_partition=index == 0,
+                )
+            elapsed_time += time.perf_counter() - start_time
+            estimations.append(n_bits)
+        entropy_encoder.encode_block(parameters)
+    return np.array(estimations), elapsed_time
+
+
+@click.command()
+@click.option("-i", "--input-path", type=click.Path(exists=True))
+@click.option("-W", "--width", default=512, show_default=True)
+@click.option("-H", "--height", default=384, show_default=True)
+@click.option("-bs", "--block-size", default=16, show_default=True)
+@click.option("-qp", "--quality-parameter", default=12, show_default=True)
+@click.option("-n", "--repeats", default=3, show_default=True)
+def main(input_path, width, height, block_size, quality_parameter, repeats):
+    """Measure block rate estimates per second of the fast and exact paths."""
+    image = load_image(input_path, width, height)
+    coded_blocks = record_coded_blocks(image, block_size, quality_parameter)
+
+    results = {
+        estimation_mode: estimate_blocks(
+            coded_blocks, block_size, estimation_mode, repeats
+        )
+        for estimation_mode in [EstimationMode.EXACT, EstimationMode.FAST]
+    }
+
+    exact_estimations, exact_time = results[EstimationMode.EXACT]
+    n_estimates = len(exact_estimations) * repeats
+    print(
+        f"{image.shape[1]}x{image.shape[0]} image, {len(exact_estimations)} "
+        f"coded {block_size}x{block_size} partitions, qp {quality_parameter}"
+    )
+    for estimation_mode, (estimations, elapsed_time) in results.items():
+        relative_errors = np.abs(estimations - exact_estimations) / np.maximum(
+            exact_estimations, 1
+        )
+        print(
+            f"{estimation_mode.name:>6}: {n_estimates / elapsed_time:.0f} "
+            f"estimates/s, speedup {exact_time / elapsed_time:.1f}x, "
+            f"mean error {100 * relative_errors.mean():.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import click
+import dataclasses
+
+from image_codec.api import decode_bytes, encode_array
+from image_codec.presets import PRESETS, SearchParameters
+
+from .common import bd_rate, best_time, load_image, psnr
+
+CONFIGURATIONS = {
+    "exhaustive": dict(fast_mode_decision=False, early_termination=False),
+    "fast mode decision": dict(fast_mode_decision=True, early_termination=False),
+    "early termination": dict(fast_mode_decision=False, early_termination=True),
+    "both": dict(fast_mode_decision=True, early_termination=True),
+}
+
+
+@click.command()
+@click.option("-i", "--input-paths", multiple=True, type=click.Path(exists=True))
+@click.option("-W", "--width", default=256, show_default=True)
+@click.option("-H", "--height", default=192, show_default=True)
+@click.option("-bs", "--block-size", default=16, show_default=True)
+@click.option("-qp", "--quality-parameters", default="4,8,12,16", show_default=True)
+@click.option(
+    "-t",
+    "--threshold",
+    default=SearchParameters.early_termination_threshold,
+    show_default=True,
+)
+@click.option("-n", "--repeats", default=2, show_default=True)
+def main(
+    input_paths, width, height, block_size, quality_parameters, threshold, repeats
+):
+    """Measure speedup and BD-rate of fast mode decision and early termination."""
+    images = [load_image(input_path, width, height) for input_path in input_paths]
+    images = images or [load_image(None, width, height)]
+    quality_parameters = [int(qp) for qp in quality_parameters.split(",")]
+
+    results = {}
+    for name, configuration in CONFIGURATIONS.items():
+        search_parameters = dataclasses.replace(
+            PRESETS["slow"], early_termination_threshold=threshold, **configuration
+        )
+        elapsed_time = 0
+        curves = []
+        for image in images:
+            rates, psnrs = [], []
+            for quality_parameter in quality_parameters:
+                encode_time, data = best_time(
+                    lambda: encode_array(
+                        image,
+                        block_size,
+                        quality_parameter,
+                        search_parameters=search_parameters,
+                    ),
+                    repeats,
+                )
+                elapsed_time += encode_time
+                rates.append(8 * len(data) / image.size)
+                psnrs.append(psnr(image, decode_bytes(data)))
+            curves.append((rates, psnrs))
+        results[name] = elapsed_time, curves
+
+    reference_time, reference_curves = results["exhaustive"]
+    print(
+        f"{len(images)} image(s), {block_size}x{block_size} blocks, "
+        f"qp {','.join(map(str, quality_parameters))}, threshold {threshold}"
+    )
+    for name, (elapsed_time, curves) in results.items():
+        bd_rates = [
+            bd_rate(*reference_curve, *curve)
+            for reference_curve, curve in zip(reference_curves, curves)
+        ]
+        print(
+            f"{name:>18}: {elapsed_time:.2f} s, "
+            f"speedup {reference_time / elapsed_time:.2f}x, "
+            f"BD-rate {100 * sum(bd_rates) / len(bd_rates):+.2f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
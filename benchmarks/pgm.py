@@ -0,0 +1,53 @@
+import click
+import io
+import os
+import tempfile
+
+from image_codec.frame import Frame
+from image_codec.pgm import read_pgm, write_pgm
+
+from .common import best_time, load_image
+
+
+@click.command()
+@click.option("-i", "--input-path", type=click.Path(exists=True))
+@click.option("-W", "--width", default=6000, show_default=True)
+@click.option("-H", "--height", default=4000, show_default=True)
+@click.option("-bs", "--block-size", default=16, show_default=True)
+@click.option("-n", "--repeats", default=5, show_default=True)
+def main(input_path, width, height, block_size, repeats):
+    """Measure PGM load and save throughput of Frame and image_codec.pgm."""
+    image = load_image(input_path, width, height)
+    n_megabytes = image.nbytes / 1e6
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "image.pgm")
+        frame = Frame(image, block_size)
+        frame.save(path)
+        with open(path, "rb") as file:
+            data = file.read()
+
+        ascii_path = os.path.join(directory, "ascii.pgm")
+        with open(ascii_path, "wb") as file:
+            file.write(f"P2\n{image.shape[1]} {image.shape[0]}\n255\n".encode())
+            file.write(" ".join(map(str, image.ravel().tolist())).encode())
+
+        measurements = {
+            "Frame.load (P5)": lambda: Frame.load(path, block_size),
+            "Frame.save (P5)": lambda: frame.save(path),
+            "read_pgm (P5 bytes)": lambda: read_pgm(io.BytesIO(data)),
+            "write_pgm (P5 bytes)": lambda: write_pgm(io.BytesIO(), image),
+            "read_pgm (P2)": lambda: read_pgm(ascii_path),
+        }
+
+        print(f"{image.shape[1]}x{image.shape[0]} image, {n_megabytes:.1f} MB")
+        for name, function in measurements.items():
+            elapsed_time, _ = best_time(function, repeats)
+            print(
+                f"{name:>20}: {elapsed_time * 1000:.1f} ms, "
+                f"{n_megabytes / elapsed_time:.0f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import click
+
+from image_codec.api import encode_array
+from image_codec.presets import PRESETS
+
+from .common import best_time, load_image
+
+
+@click.command()
+@click.option("-i", "--input-path", type=click.Path(exists=True))
+@click.option("-W", "--width", default=512, show_default=True)
+@click.option("-H", "--height", default=384, show_default=True)
+@click.option("-bs", "--block-size", default=16, show_default=True)
+@click.option("-qp", "--quality-parameter", default=12, show_default=True)
+@click.option("-n", "--repeats", default=3, show_default=True)
+def main(input_path, width, height, block_size, quality_parameter, repeats):
+    """Measure encoder throughput and bit rate of every speed preset."""
+    image = load_image(input_path, width, height)
+    n_pixels = image.size
+
+    print("| Preset      | MP/s  | bpp   |")
+    print("|-------------|-------|-------|")
+    for preset in PRESETS:
+        elapsed_time, data = best_time(
+            lambda: encode_array(image, block_size, quality_parameter, preset=preset),
+            repeats,
+        )
+        print(
+            f"| `{preset}`{' ' * (10 - len(preset))}"
+            f"| {n_pixels / 1e6 / elapsed_time:.3f} "
+            f"| {8 * len(data) / n_pixels:.3f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
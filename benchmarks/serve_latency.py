@@ -0,0 +1,147 @@
+import click
+import numpy as np
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from image_codec.pgm import write_pgm
+from image_codec.server import request
+
+from .common import load_image
+
+
+def measure(
+    function: Callable, n_requests: int, n_clients: int
+) -> Tuple[List[float], float]:
+    def timed_request(index: int) -> float:
+        start_time = time.perf_counter()
+        function(index)
+        return time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(n_clients) as executor:
+        latencies = list(executor.map(timed_request, range(n_requests)))
+    return latencies, time.perf_counter() - start_time
+
+
+def wait_for_server(socket_path: str, process: subprocess.Popen):
+    while process.poll() is None:
+        try:
+            request(socket_path, {"command": "ping"})
+            return
+        except OSError:
+            time.sleep(0.01)
+    raise Exception("Benchmark: Server exited before listening.")
+
+
+@click.command()
+@click.option("-i", "--input-path", type=click.Path(exists=True))
+@click.option("-W", "--width", default=128, show_default=True)
+@click.option("-H", "--height", default=128, show_default=True)
+@click.option("-bs", "--block-size", default=16, show_default=True)
+@click.option("-qp", "--quality-parameter", default=12, show_default=True)
+@click.option("--preset", default="ultrafast", show_default=True)
+@click.option("-r", "--requests", "n_requests", default=50, show_default=True)
+@click.option("-c", "--clients", "n_clients", default=1, show_default=True)
+@click.option("-j", "--jobs", "n_jobs", default=1, show_default=True)
+def main(
+    input_path,
+    width,
+    height,
+    block_size,
+    quality_parameter,
+    preset,
+    n_requests,
+    n_clients,
+    n_jobs,
+):
+    """Compare encode latency of a warm server with one process per image."""
+    image = load_image(input_path, width, height)
+
+    with tempfile.TemporaryDirectory() as directory:
+        image_path = os.path.join(directory, "image.pgm")
+        socket_path = os.path.join(directory, "codec.sock")
+        write_pgm(image_path, image)
+        with open(image_path, "rb") as file:
+            pgm_bytes = file.read()
+
+        header = {
+            "command": "encode",
+            "block_size": block_size,
+            "quality_parameter": quality_parameter,
+            "preset": preset,
+        }
+
+        def encode_command(index: int) -> List[str]:
+            return [
+                sys.executable,
+                "-m",
+                "image_codec",
+                "encode",
+                image_path,
+                os.path.join(directory, f"{index}.bin"),
+                "-bs",
+                str(block_size),
+                "-qp",
+                str(quality_parameter),
+                "--preset",
+                preset,
+                "--no-progress",
+            ]
+
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "image_codec",
+                "serve",
+                "--socket",
+                socket_path,
+                "--jobs",
+                str(n_jobs),
+            ],
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_server(socket_path, server)
+            request(socket_path, header, pgm_bytes)
+            results = {
+                "serve": measure(
+                    lambda index: request(socket_path, header, pgm_bytes),
+                    n_requests,
+                    n_clients,
+                ),
+            }
+        finally:
+            server.terminate()
+            server.wait()
+
+        results["process per image"] = measure(
+            lambda index: subprocess.run(
+                encode_command(index),
+                check=True,
+                stdout=subprocess.DEVNULL,
+            ),
+            n_requests,
+            n_clients,
+        )
+
+    print(
+        f"{image.shape[1]}x{image.shape[0]} image, preset {preset}, "
+        f"{n_requests} requests, {n_clients} clients, {n_jobs} jobs"
+    )
+    for name, (latencies, elapsed_time) in results.items():
+        print(
+            f"{name:>17}: {n_requests / elapsed_time:.1f} requests/s, "
+            f"p50 {np.percentile(latencies, 50) * 1000:.1f} ms, "
+            f"p99 {np.percentile(latencies, 99) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
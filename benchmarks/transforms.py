@@ -0,0 +1,83 @@
+import click
+import numpy as np
+import subprocess
+import sys
+import timeit
+
+from image_codec.modes import PredictionMode
+from image_codec.transformer import Transformer
+
+from .common import best_time
+
+IMPORTS = {
+    "numpy": "import numpy",
+    "image_codec.transformer": "import image_codec.transformer",
+    "scipy.fftpack": "import numpy, scipy.fftpack",
+}
+
+
+def import_time(statement: str, n_repeats: int) -> float:
+    return best_time(
+        lambda: subprocess.run([sys.executable, "-c", statement], check=True),
+        n_repeats,
+    )[0]
+
+
+def per_call_time(function, n_calls: int) -> float:
+    return min(timeit.repeat(function, number=n_calls, repeat=3)) / n_calls
+
+
+@click.command()
+@click.option("-bs", "--block-sizes", default="4,8,16,32", show_default=True)
+@click.option("-n", "--repeats", default=5, show_default=True)
+@click.option("--calls", default=2000, show_default=True)
+def main(block_sizes, repeats, calls):
+    """Compare startup and per-block transform time with scipy.fftpack."""
+    try:
+        from scipy import fftpack
+    except ImportError:
+        fftpack = None
+
+    for name, statement in IMPORTS.items():
+        if name.startswith("scipy") and fftpack is None:
+            continue
+        print(
+            f"startup + import {name:<23}: "
+            f"{import_time(statement, repeats) * 1000:.0f} ms"
+        )
+
+    transformer = Transformer()
+    rng = np.random.default_rng(0)
+    for block_size in [int(block_size) for block_size in block_sizes.split(",")]:
+        prediction_errors = rng.integers(-255, 256, [4, block_size, block_size])
+        single = per_call_time(
+            lambda: transformer.transform_forward_batch(
+                prediction_errors[:1], [PredictionMode.DC_PREDICTION]
+            ),
+            calls,
+        )
+        batch = per_call_time(
+            lambda: transformer.transform_forward_batch(
+                prediction_errors, list(PredictionMode)
+            ),
+            calls,
+        )
+        line = (
+            f"{block_size:>2}x{block_size:<2} DCT-II forward: matrix {single * 1e6:.1f} us, "
+            f"4-mode batch {batch * 1e6:.1f} us"
+        )
+        if fftpack is not None:
+            reference = per_call_time(
+                lambda: fftpack.dct(
+                    fftpack.dct(prediction_errors[0], axis=0, norm="ortho"),
+                    axis=1,
+                    norm="ortho",
+                ),
+                calls,
+            )
+            line += f", scipy.fftpack {reference * 1e6:.1f} us"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
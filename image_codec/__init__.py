@@ -1 +1,29 @@
-__all__ = ["decoders", "encoders"]
+import importlib
+
+LAZY_ATTRIBUTES = {
+    "encode_array": ".api",
+    "encode_file": ".api",
+    "encode_ladder": ".encoders.ladder",
+    "encode_to_target": ".encoders.rate_control",
+    "decode_bytes": ".api",
+    "decode_file": ".api",
+}
+
+__all__ = [
+    "decoders",
+    "encoders",
+    "encode_array",
+    "encode_file",
+    "encode_ladder",
+    "encode_to_target",
+    "decode_bytes",
+    "decode_file",
+]
+
+
+def __getattr__(name: str):
+    if name in ("decoders", "encoders"):
+        return importlib.import_module(f".{name}", __name__)
+    if name in LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
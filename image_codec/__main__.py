@@ -1,8 +1,59 @@
 import click
+import signal
+import sys
 import time
 
-from image_codec.encoders.encoder import Encoder
-from image_codec.decoders.decoder import Decoder
+from image_codec.presets import PRESETS, DEFAULT_PRESET
+
+
+def parse_region(context: click.Context, parameter: click.Parameter, value: str):
+    if value is None:
+        return None
+
+    try:
+        region = tuple(int(coordinate) for coordinate in value.split(","))
+    except ValueError:
+        region = ()
+    if len(region) != 4 or min(region) < 0:
+        raise click.BadParameter("expected four non-negative integers x,y,w,h.")
+    if region[2] == 0 or region[3] == 0:
+        raise click.BadParameter("width and height must be positive.")
+
+    return region
+
+
+def parse_quality_parameters(
+    context: click.Context, parameter: click.Parameter, value: str
+):
+    if value is None:
+        return None
+
+    try:
+        quality_parameters = [
+            int(quality_parameter) for quality_parameter in value.split(",")
+        ]
+    except ValueError:
+        quality_parameters = []
+    if not quality_parameters or not all(
+        0 <= quality_parameter <= 31 for quality_parameter in quality_parameters
+    ):
+        raise click.BadParameter("expected comma-separated integers in range 0,31.")
+    if len(set(quality_parameters)) != len(quality_parameters):
+        raise click.BadParameter("quality parameters must not repeat.")
+
+    return quality_parameters
+
+
+def check_exclusive_options(context: click.Context, *names: str):
+    given_options = [
+        parameter.opts[0]
+        for parameter in context.command.params
+        if parameter.name in names
+        and context.get_parameter_source(parameter.name)
+        is not click.core.ParameterSource.DEFAULT
+    ]
+    if len(given_options) > 1:
+        raise click.UsageError(f"{', '.join(given_options)} cannot be combined.")
 
 
 @click.group()
@@ -31,48 +82,418 @@ def main():
     type=click.IntRange(0, 31),
     help="Quality parameter of the encoder (same as the quantization step size). [range: 0,31]",
 )
+@click.option(
+    "-qpl",
+    "--qp-ladder",
+    type=str,
+    callback=parse_quality_parameters,
+    help="Comma-separated quality parameters to encode the image with, e.g. 8,12,16,20. Cannot be combined with -qp. Output and reconstruction paths may contain {qp}; otherwise _qp<N> is appended to the file name.",
+)
+@click.option(
+    "-tb",
+    "--target-bytes",
+    type=click.IntRange(1),
+    help="Size budget of the bitstream in bytes. The quality parameter is searched with fast rate estimates. Cannot be combined with -qp or --qp-ladder.",
+)
+@click.option(
+    "-tbpp",
+    "--target-bpp",
+    type=click.FloatRange(0, min_open=True),
+    help="Size budget of the bitstream in bits per pixel. See --target-bytes.",
+)
+@click.option(
+    "-p",
+    "--preset",
+    default=DEFAULT_PRESET,
+    show_default=True,
+    type=click.Choice(list(PRESETS)),
+    help="Speed preset of the encoder. Faster presets search fewer modes and use approximate rate estimation.",
+)
+@click.option(
+    "-tc",
+    "--tile-columns",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1, 65535),
+    help="Number of independently coded tile columns.",
+)
+@click.option(
+    "-tr",
+    "--tile-rows",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1, 65535),
+    help="Number of independently coded tile rows.",
+)
+@click.option(
+    "-wpp",
+    "--wavefront",
+    is_flag=True,
+    help="Code every block row as its own substream so rows can be processed in a staggered pipeline. Cannot be combined with tiles.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Number of worker processes encoding tiles, wavefront rows or ladder quality parameters in parallel.",
+)
+@click.option(
+    "-ao",
+    "--analysis-out",
+    type=click.Path(),
+    help="Write the partitioning and prediction mode decisions with their cost margins to this sidecar file.",
+)
+@click.option(
+    "-ai",
+    "--analysis-in",
+    type=click.Path(exists=True),
+    help="Replay the decisions of a sidecar file written by --analysis-out instead of searching them.",
+)
+@click.option(
+    "-rm",
+    "--refine-margin",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(0),
+    help="Search blocks again whose relative cost margin in the replayed sidecar is below this value.",
+)
 @click.option(
     "-r",
     "--reconstruction-path",
     type=str,
     help="reconstruction path of the encoder (reconstructed image). If not given, no reconstruction will be saved.",
 )
+@click.option(
+    "--progress/--no-progress",
+    default=True,
+    show_default=True,
+    help="Show a progress bar while encoding. Requires tqdm to be installed.",
+)
 def encode(**kwargs):
     """Encode a PGM image."""
+    check_exclusive_options(
+        click.get_current_context(),
+        "quality_parameter",
+        "qp_ladder",
+        "target_bytes",
+        "target_bpp",
+    )
+
     print("Start encoding process...")
-    start_time = time.process_time()
+    start_time = time.perf_counter()
 
     print("Processing...")
-    encoder = Encoder(
-        kwargs.get("input_path"),
-        kwargs.get("output_path"),
-        kwargs.get("block_size"),
-        kwargs.get("quality_parameter"),
-        kwargs.get("reconstruction_path"),
-    )
-    encoder.encode()
+    try:
+        if kwargs.get("target_bytes") or kwargs.get("target_bpp"):
+            from image_codec.encoders.rate_control import encode_to_target
+
+            result = encode_to_target(
+                kwargs.get("input_path"),
+                kwargs.get("output_path"),
+                kwargs.get("block_size"),
+                kwargs.get("target_bytes"),
+                kwargs.get("target_bpp"),
+                kwargs.get("reconstruction_path"),
+                preset=kwargs.get("preset"),
+                n_tile_columns=kwargs.get("tile_columns"),
+                n_tile_rows=kwargs.get("tile_rows"),
+                wavefront=kwargs.get("wavefront"),
+                analysis_in_path=kwargs.get("analysis_in"),
+                analysis_out_path=kwargs.get("analysis_out"),
+                refine_margin=kwargs.get("refine_margin"),
+                n_jobs=kwargs.get("jobs"),
+                show_progress=kwargs.get("progress"),
+            )
+            print(
+                f"Selected quality parameter {result.quality_parameter} after "
+                f"{result.n_probes} probing passes and {result.n_encodes} full encodes "
+                f"in {result.elapsed_time * 1000} ms: "
+                f"{result.n_bytes} of {result.target_bytes} bytes."
+            )
+            if not result.meets_target():
+                print(
+                    "Target size cannot be reached with the highest quality parameter."
+                )
+        elif kwargs.get("qp_ladder"):
+            from image_codec.encoders.ladder import encode_ladder
+
+            output_paths = encode_ladder(
+                kwargs.get("input_path"),
+                kwargs.get("output_path"),
+                kwargs.get("block_size"),
+                kwargs.get("qp_ladder"),
+                kwargs.get("reconstruction_path"),
+                n_jobs=kwargs.get("jobs"),
+                preset=kwargs.get("preset"),
+                n_tile_columns=kwargs.get("tile_columns"),
+                n_tile_rows=kwargs.get("tile_rows"),
+                wavefront=kwargs.get("wavefront"),
+                analysis_in_path=kwargs.get("analysis_in"),
+                analysis_out_path=kwargs.get("analysis_out"),
+                refine_margin=kwargs.get("refine_margin"),
+                show_progress=kwargs.get("progress"),
+            )
+            for output_path in output_paths:
+                print(f"Wrote {output_path}.")
+        else:
+            from image_codec.api import encode_file
+
+            encode_file(
+                kwargs.get("input_path"),
+                kwargs.get("output_path"),
+                kwargs.get("block_size"),
+                kwargs.get("quality_parameter"),
+                reconstruction_path=kwargs.get("reconstruction_path"),
+                preset=kwargs.get("preset"),
+                n_tile_columns=kwargs.get("tile_columns"),
+                n_tile_rows=kwargs.get("tile_rows"),
+                wavefront=kwargs.get("wavefront"),
+                analysis_in_path=kwargs.get("analysis_in"),
+                analysis_out_path=kwargs.get("analysis_out"),
+                refine_margin=kwargs.get("refine_margin"),
+                n_jobs=kwargs.get("jobs"),
+                show_progress=kwargs.get("progress"),
+            )
+    except Exception as exception:
+        raise click.ClickException(str(exception))
 
     print(
-        f"Finished encoding process in {(time.process_time() - start_time) * 1000} ms."
+        f"Finished encoding process in {(time.perf_counter() - start_time) * 1000} ms."
     )
 
 
 @main.command()
 @click.argument("input-path", required=True, type=click.Path(exists=True))
 @click.argument("output-path", required=True, type=click.Path())
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Number of worker processes decoding tiles or wavefront rows in parallel.",
+)
+@click.option(
+    "-c",
+    "--crop",
+    type=str,
+    callback=parse_region,
+    help="Region x,y,w,h to decode. Only the tiles covering the region are decoded.",
+)
 def decode(**kwargs):
     """Decode a PGM image."""
+    from image_codec.api import decode_file
+
     print("Start decoding process...")
-    start_time = time.process_time()
+    start_time = time.perf_counter()
 
     print("Decoding...")
-    decoder = Decoder(kwargs.get("input_path"), kwargs.get("output_path"))
-    decoder.decode()
+    try:
+        decode_file(
+            kwargs.get("input_path"),
+            kwargs.get("output_path"),
+            region=kwargs.get("crop"),
+            n_jobs=kwargs.get("jobs"),
+        )
+    except Exception as exception:
+        raise click.ClickException(str(exception))
 
     print(
-        f"Finished decoding process in {(time.process_time() - start_time) * 1000} ms."
+        f"Finished decoding process in {(time.perf_counter() - start_time) * 1000} ms."
     )
 
 
+def print_batch_summary(summary: "batch.BatchSummary", action: str):
+    for input_path, message in summary.failures:
+        click.echo(f"Failed to {action} {input_path}: {message}", err=True)
+
+    print(
+        f"Processed {summary.n_files} files ({summary.n_skipped} up to date, "
+        f"{len(summary.failures)} failed) in {summary.elapsed_time * 1000} ms: "
+        f"{summary.megapixels():.2f} MP, {summary.megapixels_per_second():.2f} MP/s, "
+        f"{summary.n_bytes} bytes, {summary.bits_per_pixel():.3f} bpp."
+    )
+    if summary.failures:
+        sys.exit(1)
+
+
+@main.command("encode-batch")
+@click.argument(
+    "input-directory", required=True, type=click.Path(exists=True, file_okay=False)
+)
+@click.argument("output-directory", required=True, type=click.Path(file_okay=False))
+@click.option(
+    "-bs",
+    "--block-size",
+    default=16,
+    show_default=True,
+    type=int,
+    help="Block size of the encoder.",
+)
+@click.option(
+    "-qp",
+    "--quality-parameter",
+    default=12,
+    show_default=True,
+    type=click.IntRange(0, 31),
+    help="Quality parameter of the encoder (same as the quantization step size). [range: 0,31]",
+)
+@click.option(
+    "-p",
+    "--preset",
+    default=DEFAULT_PRESET,
+    show_default=True,
+    type=click.Choice(list(PRESETS)),
+    help="Speed preset of the encoder. Faster presets search fewer modes and use approximate rate estimation.",
+)
+@click.option(
+    "-tc",
+    "--tile-columns",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1, 65535),
+    help="Number of independently coded tile columns.",
+)
+@click.option(
+    "-tr",
+    "--tile-rows",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1, 65535),
+    help="Number of independently coded tile rows.",
+)
+@click.option(
+    "-wpp",
+    "--wavefront",
+    is_flag=True,
+    help="Code every block row as its own substream. Cannot be combined with tiles.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Number of worker processes encoding files in parallel, largest files first.",
+)
+@click.option(
+    "-e",
+    "--extension",
+    default=".bin",
+    show_default=True,
+    type=str,
+    help="File extension of the bitstreams.",
+)
+@click.option(
+    "-f",
+    "--force",
+    is_flag=True,
+    help="Encode all files, even if their bitstream is newer than the image and was encoded with the same options.",
+)
+def encode_batch(**kwargs):
+    """Encode all PGM images of a directory tree."""
+    from image_codec.batch import encode_batch
+
+    summary = encode_batch(
+        kwargs.get("input_directory"),
+        kwargs.get("output_directory"),
+        n_jobs=kwargs.get("jobs"),
+        extension=kwargs.get("extension"),
+        force=kwargs.get("force"),
+        block_size=kwargs.get("block_size"),
+        quality_parameter=kwargs.get("quality_parameter"),
+        preset=kwargs.get("preset"),
+        n_tile_columns=kwargs.get("tile_columns"),
+        n_tile_rows=kwargs.get("tile_rows"),
+        wavefront=kwargs.get("wavefront"),
+    )
+    print_batch_summary(summary, "encode")
+
+
+@main.command("decode-batch")
+@click.argument(
+    "input-directory", required=True, type=click.Path(exists=True, file_okay=False)
+)
+@click.argument("output-directory", required=True, type=click.Path(file_okay=False))
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Number of worker processes decoding files in parallel, largest files first.",
+)
+@click.option(
+    "-e",
+    "--extension",
+    default=".bin",
+    show_default=True,
+    type=str,
+    help="File extension of the bitstreams.",
+)
+@click.option(
+    "-f",
+    "--force",
+    is_flag=True,
+    help="Decode all files, even if their image is newer than the bitstream.",
+)
+def decode_batch(**kwargs):
+    """Decode all bitstreams of a directory tree to PGM images."""
+    from image_codec.batch import decode_batch
+
+    summary = decode_batch(
+        kwargs.get("input_directory"),
+        kwargs.get("output_directory"),
+        n_jobs=kwargs.get("jobs"),
+        extension=kwargs.get("extension"),
+        force=kwargs.get("force"),
+    )
+    print_batch_summary(summary, "decode")
+
+
+@main.command()
+@click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(),
+    help="Path of a Unix socket to listen on. If not given, requests are read from stdin and responses are written to stdout.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1),
+    help="Number of warm worker processes handling requests.",
+)
+def serve(**kwargs):
+    """Serve encode and decode requests from a persistent process.
+
+    Every message is a big-endian uint32 header size and uint32 body size,
+    followed by a JSON header and the body. Requests have a "command" of
+    "encode" (body: PGM image) or "decode" (body: bitstream) plus encoder
+    options or a decode "region". Responses have a "status" of "ok" or
+    "error" and carry the bitstream or PGM image as body. With --jobs,
+    requests are handled by worker processes while the next ones are read,
+    and responses are written in request order.
+    """
+    from image_codec.server import Server
+
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit())
+
+    with Server(kwargs.get("jobs")) as server:
+        if kwargs.get("socket_path"):
+            click.echo(f"Listening on {kwargs.get('socket_path')}...", err=True)
+            server.serve_socket(kwargs.get("socket_path"))
+        else:
+            try:
+                server.serve_stream(sys.stdin.buffer, sys.stdout.buffer)
+            except Exception as exception:
+                raise click.ClickException(str(exception))
+
+
 if __name__ == "__main__":
     main()
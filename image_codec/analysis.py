@@ -0,0 +1,181 @@
+import numpy as np
+import struct
+import zlib
+
+from typing import Dict, List, Optional, Tuple
+
+from .block import Block
+from .modes import PartitioningMode, PredictionMode
+from .parameters import PartitioningModeParameters
+from .shared_array import SharedArray
+
+
+class Analysis:
+
+    N_PARTITIONS = 4
+    UNKNOWN_MODE = 255
+    MARGIN_STEP = 0.005
+    MAX_MARGIN = 255
+    HEADER_FORMAT = ">HBHH"
+
+    def __init__(
+        self,
+        block_size: int,
+        quality_parameter: int,
+        partitioning_modes: np.ndarray,
+        prediction_modes: np.ndarray,
+        margins: np.ndarray,
+    ):
+        self.block_size = block_size
+        self.quality_parameter = quality_parameter
+        self.partitioning_modes = partitioning_modes
+        self.prediction_modes = prediction_modes
+        self.margins = margins
+        self.shared_arrays = None
+
+    @classmethod
+    def empty(
+        cls,
+        block_size: int,
+        quality_parameter: int,
+        n_block_rows: int,
+        n_block_columns: int,
+    ) -> "analysis.Analysis":
+        shape = (n_block_rows, n_block_columns)
+        return cls(
+            block_size,
+            quality_parameter,
+            np.full(shape, cls.UNKNOWN_MODE, dtype=np.uint8),
+            np.full(shape + (cls.N_PARTITIONS,), cls.UNKNOWN_MODE, dtype=np.uint8),
+            np.zeros(shape, dtype=np.uint8),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "analysis.Analysis":
+        with open(path, "rb") as file:
+            data = file.read()
+        try:
+            block_size, quality_parameter, n_block_rows, n_block_columns = (
+                struct.unpack_from(cls.HEADER_FORMAT, data)
+            )
+            arrays = np.frombuffer(
+                zlib.decompress(data[struct.calcsize(cls.HEADER_FORMAT) :]), np.uint8
+            )
+        except (struct.error, zlib.error):
+            raise Exception("Analysis: Invalid sidecar file.")
+
+        n_blocks = n_block_rows * n_block_columns
+        if arrays.size != n_blocks * (cls.N_PARTITIONS + 2):
+            raise Exception("Analysis: Invalid sidecar file.")
+
+        shape = (n_block_rows, n_block_columns)
+        return cls(
+            block_size,
+            quality_parameter,
+            arrays[:n_blocks].reshape(shape).copy(),
+            arrays[n_blocks:-n_blocks].reshape(shape + (cls.N_PARTITIONS,)).copy(),
+            arrays[-n_blocks:].reshape(shape).copy(),
+        )
+
+    def save(self, path: str):
+        with open(path, "wb") as file:
+            file.write(
+                struct.pack(
+                    self.HEADER_FORMAT,
+                    self.block_size,
+                    self.quality_parameter,
+                    *self.partitioning_modes.shape,
+                )
+            )
+            file.write(
+                zlib.compress(
+                    b"".join(array.tobytes() for array in self.arrays().values()), 9
+                )
+            )
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "partitioning_modes": self.partitioning_modes,
+            "prediction_modes": self.prediction_modes,
+            "margins": self.margins,
+        }
+
+    def validate(self, block_size: int, n_block_rows: int, n_block_columns: int):
+        if self.block_size != block_size or self.partitioning_modes.shape != (
+            n_block_rows,
+            n_block_columns,
+        ):
+            raise Exception("Analysis: Analysis does not match the frame.")
+
+    def index(self, block: Block) -> Tuple[int, int]:
+        return block.y // self.block_size, block.x // self.block_size
+
+    def record(
+        self, block: Block, parameters: PartitioningModeParameters, margin: float
+    ):
+        index = self.index(block)
+        self.partitioning_modes[index] = parameters.partitioning_mode
+        self.prediction_modes[index] = self.UNKNOWN_MODE
+        for partition_index, prediction_mode_parameters in enumerate(
+            parameters.prediction_mode_parameters_list
+        ):
+            self.prediction_modes[index + (partition_index,)] = (
+                prediction_mode_parameters.prediction_mode
+            )
+        self.margins[index] = self.quantize_margins(margin)
+
+    @classmethod
+    def quantize_margins(cls, margins: np.ndarray) -> np.ndarray:
+        return np.minimum(
+            np.floor(np.divide(margins, cls.MARGIN_STEP)), cls.MAX_MARGIN
+        ).astype(np.uint8)
+
+    def margin(self, block: Block) -> float:
+        return (self.margins[self.index(block)] + 0.5) * self.MARGIN_STEP
+
+    def decision(
+        self, block: Block, min_margin: float = 0
+    ) -> Optional[Tuple[PartitioningMode, List[PredictionMode]]]:
+        index = self.index(block)
+        if (
+            self.partitioning_modes[index] == self.UNKNOWN_MODE
+            or self.margin(block) < min_margin
+        ):
+            return None
+
+        partitioning_mode = PartitioningMode(self.partitioning_modes[index])
+        n_partitions = (
+            1 if partitioning_mode == PartitioningMode.NON_SUB_PARTITIONING else 4
+        )
+        return partitioning_mode, [
+            PredictionMode(prediction_mode)
+            for prediction_mode in self.prediction_modes[index][:n_partitions]
+        ]
+
+    def share(self):
+        self.shared_arrays = {
+            name: SharedArray.copy_of(array) for name, array in self.arrays().items()
+        }
+        self.attach()
+
+    def unshare(self):
+        for name, shared_array in self.shared_arrays.items():
+            setattr(self, name, shared_array.array.copy())
+            shared_array.close()
+        self.shared_arrays = None
+
+    def attach(self):
+        for name, shared_array in self.shared_arrays.items():
+            setattr(self, name, shared_array.array)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if self.shared_arrays is not None:
+            for name in self.shared_arrays:
+                del state[name]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        if self.shared_arrays is not None:
+            self.attach()
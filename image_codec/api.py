@@ -0,0 +1,82 @@
+import io
+import numpy as np
+import os
+
+from typing import BinaryIO, Tuple, Union
+
+from .decoders.decoder import Decoder
+from .encoders.encoder import Encoder
+from .frame import Frame
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+def encode_array(
+    array: np.ndarray, block_size: int = 16, quality_parameter: int = 12, **options
+) -> bytes:
+    output = io.BytesIO()
+    Encoder(
+        None,
+        output,
+        block_size,
+        quality_parameter,
+        frame=Frame(validate_array(array), block_size),
+        show_progress=False,
+        **options,
+    ).encode()
+    return output.getvalue()
+
+
+def encode_file(
+    input_path: Source,
+    output_path: Source,
+    block_size: int = 16,
+    quality_parameter: int = 12,
+    show_progress: bool = False,
+    **options,
+):
+    Encoder(
+        input_path,
+        output_path,
+        block_size,
+        quality_parameter,
+        show_progress=show_progress,
+        **options,
+    ).encode()
+
+
+def decode_bytes(
+    data: Union[bytes, bytearray, memoryview, BinaryIO],
+    region: Tuple[int, int, int, int] = None,
+    **options,
+) -> np.ndarray:
+    decoder = Decoder(data, None, **options)
+    if region is not None:
+        decoder.decode_region(*region)
+        x, y, width, height = region
+        return decoder.decoded_frame[y : y + height, x : x + width]
+
+    decoder.decode()
+    return decoder.decoded_frame[
+        : decoder.decoded_frame.height, : decoder.decoded_frame.width
+    ]
+
+
+def decode_file(
+    input_path: Source,
+    output_path: Source,
+    region: Tuple[int, int, int, int] = None,
+    **options,
+):
+    decoder = Decoder(input_path, output_path, **options)
+    if region is not None:
+        decoder.decode_region(*region)
+    else:
+        decoder.decode()
+
+
+def validate_array(array: np.ndarray) -> np.ndarray:
+    array = np.asarray(array)
+    if array.ndim != 2 or array.dtype != np.uint8:
+        raise Exception("API: Expected a two-dimensional uint8 array.")
+    return array
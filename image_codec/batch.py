@@ -0,0 +1,223 @@
+import dataclasses
+import json
+import os
+import time
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from .decoders.decoder import Decoder
+from .encoders.encoder import Encoder
+
+IMAGE_EXTENSION = ".pgm"
+BITSTREAM_EXTENSION = ".bin"
+MANIFEST_NAME = ".batch.json"
+
+Job = Tuple[str, str]
+
+
+@dataclasses.dataclass
+class BatchSummary:
+    n_files: int = 0
+    n_skipped: int = 0
+    n_pixels: int = 0
+    n_bytes: int = 0
+    elapsed_time: float = 0
+    failures: List[Tuple[str, str]] = dataclasses.field(default_factory=list)
+
+    def megapixels(self) -> float:
+        return self.n_pixels / 1e6
+
+    def megapixels_per_second(self) -> float:
+        return self.megapixels() / self.elapsed_time if self.elapsed_time else 0
+
+    def bits_per_pixel(self) -> float:
+        return 8 * self.n_bytes / self.n_pixels if self.n_pixels else 0
+
+
+def encode_batch(
+    input_directory: str,
+    output_directory: str,
+    n_jobs: int = 1,
+    extension: str = BITSTREAM_EXTENSION,
+    force: bool = False,
+    **encoder_arguments,
+) -> BatchSummary:
+    return run_batch(
+        encode_job,
+        find_jobs(input_directory, output_directory, IMAGE_EXTENSION, extension),
+        output_directory,
+        n_jobs,
+        force,
+        encoder_arguments,
+    )
+
+
+def decode_batch(
+    input_directory: str,
+    output_directory: str,
+    n_jobs: int = 1,
+    extension: str = BITSTREAM_EXTENSION,
+    force: bool = False,
+) -> BatchSummary:
+    return run_batch(
+        decode_job,
+        find_jobs(input_directory, output_directory, extension, IMAGE_EXTENSION),
+        output_directory,
+        n_jobs,
+        force,
+        {},
+    )
+
+
+def find_jobs(
+    input_directory: str,
+    output_directory: str,
+    input_extension: str,
+    output_extension: str,
+) -> List[Job]:
+    jobs = []
+    for directory, directory_names, file_names in os.walk(input_directory):
+        directory_names.sort()
+        for file_name in sorted(file_names):
+            root, extension = os.path.splitext(file_name)
+            if extension.lower() != input_extension.lower():
+                continue
+
+            input_path = os.path.join(directory, file_name)
+            output_path = os.path.join(
+                output_directory,
+                os.path.relpath(directory, input_directory),
+                root + output_extension,
+            )
+            jobs.append((input_path, os.path.normpath(output_path)))
+
+    return jobs
+
+
+def is_up_to_date(
+    input_path: str, output_path: str, options: Dict, recorded_options: Dict
+) -> bool:
+    if not os.path.exists(output_path) or recorded_options != options:
+        return False
+    return os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+
+
+def load_manifest(output_directory: str) -> Dict[str, Dict]:
+    try:
+        with open(os.path.join(output_directory, MANIFEST_NAME)) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def manifest_key(output_path: str, output_directory: str) -> str:
+    return os.path.relpath(output_path, output_directory)
+
+
+def save_manifest(output_directory: str, manifest: Dict[str, Dict]):
+    path = os.path.join(output_directory, MANIFEST_NAME)
+    os.makedirs(output_directory, exist_ok=True)
+    with open(f"{path}.tmp", "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def run_batch(
+    function: Callable,
+    jobs: List[Job],
+    output_directory: str,
+    n_jobs: int,
+    force: bool,
+    arguments: Dict,
+) -> BatchSummary:
+    start_time = time.perf_counter()
+    summary = BatchSummary()
+    manifest = load_manifest(output_directory)
+    options = json.loads(json.dumps(arguments))
+
+    pending_jobs = [
+        job
+        for job in jobs
+        if force
+        or not is_up_to_date(
+            *job, options, manifest.get(manifest_key(job[1], output_directory))
+        )
+    ]
+    summary.n_skipped = len(jobs) - len(pending_jobs)
+    pending_jobs.sort(key=lambda job: os.path.getsize(job[0]), reverse=True)
+
+    if n_jobs <= 1 or len(pending_jobs) <= 1:
+        results = [
+            run_job(function, input_path, output_path, arguments)
+            for input_path, output_path in pending_jobs
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(pending_jobs))
+        ) as executor:
+            futures = [
+                executor.submit(run_job, function, input_path, output_path, arguments)
+                for input_path, output_path in pending_jobs
+            ]
+            results = [collect_result(future) for future in futures]
+
+    for (input_path, output_path), (n_pixels, n_bytes, error) in zip(
+        pending_jobs, results
+    ):
+        if error is not None:
+            summary.failures.append((input_path, error))
+            continue
+
+        manifest[manifest_key(output_path, output_directory)] = options
+        summary.n_files += 1
+        summary.n_pixels += n_pixels
+        summary.n_bytes += n_bytes
+
+    if summary.n_files:
+        save_manifest(output_directory, manifest)
+
+    summary.elapsed_time = time.perf_counter() - start_time
+    return summary
+
+
+def collect_result(future: Future) -> Tuple[int, int, str]:
+    try:
+        return future.result()
+    except Exception as exception:
+        return 0, 0, str(exception) or type(exception).__name__
+
+
+def run_job(
+    function: Callable, input_path: str, output_path: str, arguments: Dict
+) -> Tuple[int, int, str]:
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    temporary_path = f"{output_path}.tmp"
+
+    try:
+        n_pixels, n_bytes = function(input_path, temporary_path, arguments)
+        os.replace(temporary_path, output_path)
+    except Exception as exception:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        return 0, 0, str(exception) or type(exception).__name__
+
+    return n_pixels, n_bytes, None
+
+
+def encode_job(input_path: str, output_path: str, arguments: Dict) -> Tuple[int, int]:
+    encoder = Encoder(
+        input_path, output_path, n_jobs=1, show_progress=False, **arguments
+    )
+    encoder.encode()
+    return encoder.frame.width * encoder.frame.height, os.path.getsize(output_path)
+
+
+def decode_job(input_path: str, output_path: str, arguments: Dict) -> Tuple[int, int]:
+    decoder = Decoder(input_path, output_path, n_jobs=1, **arguments)
+    decoder.decode()
+    return (
+        decoder.meta_parameters.width * decoder.meta_parameters.height,
+        os.path.getsize(input_path),
+    )
@@ -1,12 +1,25 @@
+import os
+
+from typing import BinaryIO, Optional, Union
+
+
 class Bitstream:
-    def __init__(self, file_path: str, file_mode: str):
-        self.file = open(file_path, file_mode)
+    def __init__(
+        self, file: Optional[Union[str, os.PathLike, BinaryIO]], file_mode: str
+    ):
+        self.owns_file = isinstance(file, (str, os.PathLike))
+        self.file = open(file, file_mode) if self.owns_file else file
         self.buffer = 0
         self.bit_counter = 0
 
     def align_byte(self):
         pass
 
+    def flush(self):
+        pass
+
     def terminate(self):
         self.align_byte()
-        self.file.close()
+        self.flush()
+        if self.owns_file:
+            self.file.close()
@@ -1,21 +1,60 @@
+import io
+import mmap
+import os
+
+from typing import BinaryIO, Union
+
 from .bitstream import Bitstream
 
 
 class InputBitstream(Bitstream):
-    def __init__(self, input_path: str):
-        super().__init__(input_path, "rb")
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, BinaryIO, bytes, bytearray, memoryview],
+    ):
+        in_memory = isinstance(source, (bytes, bytearray, memoryview))
+        super().__init__(None if in_memory else source, "rb")
+        self.mmap = None
+        self.position = 0
+        self.data = memoryview(source if in_memory else self._map_file()).cast("B")
+
+        self.size = len(self.data)
+
+    def _map_file(self) -> Union[mmap.mmap, bytes]:
+        try:
+            file_number = self.file.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            return self.file.read()
+
+        self.position = self.file.tell()
+        if os.fstat(file_number).st_size == 0:
+            return b""
+
+        self.mmap = mmap.mmap(file_number, 0, access=mmap.ACCESS_READ)
+        return self.mmap
 
     def read_bit(self) -> int:
         if self.bit_counter == 0:
-            byte_s = self.file.read(1)
-            self._validate_bytes(byte_s)
-            self.buffer = byte_s[0]
+            self.buffer = self.read_byte()
             self.bit_counter = 8
 
         self.bit_counter -= 1
 
         return (self.buffer >> self.bit_counter) & 1
 
+    def read_byte(self) -> int:
+        if self.bit_counter:
+            return self.read_bits(8)
+
+        try:
+            byte = self.data[self.position]
+        except IndexError:
+            raise Exception("InputBitstream: Tried to read byte after eof.")
+
+        self.position += 1
+
+        return byte
+
     def read_bits(self, n_bits: int) -> int:
         if n_bits <= self.bit_counter:
             self.bit_counter -= n_bits
@@ -28,25 +67,37 @@ class InputBitstream(Bitstream):
             n_bits -= self.bit_counter
             self.bit_counter = 0
 
-        while n_bits >= 8:
-            byte_s = self.file.read(1)
-            self._validate_bytes(byte_s)
-            bit_pattern = (bit_pattern << 8) | int(byte_s[0])
-            n_bits -= 8
+        n_bytes = n_bits >> 3
+        n_bits &= 7
+
+        if n_bytes:
+            self._validate_position(self.position + n_bytes)
+            bit_pattern = (bit_pattern << (n_bytes << 3)) | int.from_bytes(
+                self.data[self.position : self.position + n_bytes], byteorder="big"
+            )
+            self.position += n_bytes
 
         if n_bits > 0:
-            byte_s = self.file.read(1)
-            self._validate_bytes(byte_s)
-            self.buffer = byte_s[0]
+            self.buffer = self.read_byte()
             self.bit_counter = 8 - n_bits
             bit_pattern = (bit_pattern << n_bits) | (self.buffer >> self.bit_counter)
 
         return bit_pattern
 
+    def seek(self, position: int):
+        self._validate_position(position)
+        self.position = position
+        self.bit_counter = 0
+
     def align_byte(self):
         self.bit_counter = 0
 
-    @staticmethod
-    def _validate_bytes(byte_s: bytes):
-        if not byte_s:
+    def terminate(self):
+        self.data.release()
+        if self.mmap is not None:
+            self.mmap.close()
+        super().terminate()
+
+    def _validate_position(self, position: int):
+        if position > self.size:
             raise Exception("InputBitstream: Tried to read byte after eof.")
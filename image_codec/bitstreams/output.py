@@ -1,19 +1,51 @@
+import os
+
+from typing import BinaryIO, Union
+
 from .bitstream import Bitstream
 
 
 class OutputBitstream(Bitstream):
-    def __init__(self, output_path: str):
-        super().__init__(output_path, "+wb")
+
+    FLUSH_SIZE = 1 << 16
+
+    def __init__(self, output: Union[str, os.PathLike, BinaryIO]):
+        super().__init__(output, "+wb")
+        self.data = bytearray()
 
     def write_bit(self, bit: int):
         self.buffer = (self.buffer << 1) | int(bool(bit))
         self.bit_counter += 1
 
         if self.bit_counter == 8:
-            self.file.write(self.buffer.to_bytes(1, byteorder="big"))
+            self.data.append(self.buffer)
             self.buffer = 0
             self.bit_counter = 0
 
+            if len(self.data) >= self.FLUSH_SIZE:
+                self.flush()
+
+    def write_byte(self, byte: int):
+        if self.bit_counter:
+            self.write_bits(byte, 8)
+            return
+
+        self.data.append(byte & 255)
+
+        if len(self.data) >= self.FLUSH_SIZE:
+            self.flush()
+
+    def write_bytes(self, data: bytes):
+        if self.bit_counter:
+            for byte in data:
+                self.write_bits(byte, 8)
+            return
+
+        self.data += data
+
+        if len(self.data) >= self.FLUSH_SIZE:
+            self.flush()
+
     def write_bits(self, bit_pattern: int, n_bits: int):
         if self.bit_counter + n_bits < 8:
             self.buffer = (self.buffer << n_bits) | int(
@@ -28,16 +60,24 @@ class OutputBitstream(Bitstream):
                 (bit_pattern >> (n_bits - free_bits)) & ((1 << free_bits) - 1)
             )
             n_bits -= free_bits
-            self.file.write(self.buffer.to_bytes(1, byteorder="big"))
+            self.data.append(self.buffer)
 
         while n_bits >= 8:
             n_bits -= 8
-            self.buffer = int(bit_pattern >> n_bits) & 255
-            self.file.write(self.buffer.to_bytes(1, byteorder="big"))
+            self.data.append(int(bit_pattern >> n_bits) & 255)
 
         self.buffer = int(bit_pattern & ((1 << n_bits) - 1))
         self.bit_counter = n_bits
 
+        if len(self.data) >= self.FLUSH_SIZE:
+            self.flush()
+
     def align_byte(self):
         if self.bit_counter != 0:
             self.write_bits(0, 8 - self.bit_counter)
+
+    def flush(self):
+        if self.data:
+            self.file.write(self.data)
+            self.data.clear()
+        self.file.flush()
@@ -4,7 +4,14 @@ from typing import List, Tuple
 
 from .modes import PartitioningMode, PredictionMode
 from .transformer import Transformer
-from .utils import sort_diagonal, invert_diagonal_sort
+from .scan_order import scan_order
+
+SCAN_ORDERS = {
+    PredictionMode.DC_PREDICTION: "diagonal",
+    PredictionMode.VERTICAL_PREDICTION: "horizontal",
+    PredictionMode.HORIZONTAL_PREDICTION: "vertical",
+    PredictionMode.PLANAR_PREDICTION: "diagonal",
+}
 
 
 class Block:
@@ -60,14 +67,53 @@ class Block:
     ):
         self.predict(prediction_mode, prediction_calculator, inter, mx, my)
         self.prediction_error = self.data.astype("int") - self.prediction
-        transform_coefficients = transformer.transform_forward(self, prediction_mode)
-        self.q_indexes = (
-            np.sign(transform_coefficients)
-            * np.floor((np.abs(transform_coefficients) / quality_parameter) + 0.4)
-        ).astype("int")
+        self.q_indexes = transformer.quantize(
+            transformer.transform_forward(self, prediction_mode), quality_parameter
+        )
         self.reconstruct(prediction_mode, quality_parameter, transformer)
         self.sort_q_indexes(prediction_mode)
 
+    def encode_candidates(
+        self,
+        prediction_modes: List[PredictionMode],
+        prediction_calculator: "predictor.Predictor",
+        quality_parameter: float,
+        transformer: Transformer,
+        predictions: np.ndarray = None,
+    ) -> List["block.Block"]:
+        if predictions is None:
+            predictions = prediction_calculator.get_predictions(self)[prediction_modes]
+        prediction_errors = self.data.astype("int") - predictions
+        q_indexes = transformer.quantize(
+            transformer.transform_forward_batch(prediction_errors, prediction_modes),
+            quality_parameter,
+        )
+        reconstructions = np.clip(
+            transformer.transform_backward_batch(
+                q_indexes * quality_parameter, prediction_modes
+            )
+            + predictions,
+            0,
+            255,
+        ).astype("uint8")
+
+        candidates = []
+        for index, prediction_mode in enumerate(prediction_modes):
+            candidate = Block(
+                self.x,
+                self.y,
+                self.block_size,
+                self.data,
+                predictions[index],
+                prediction_errors[index],
+                q_indexes[index],
+                reconstructions[index],
+            )
+            candidate.sort_q_indexes(prediction_mode)
+            candidates.append(candidate)
+
+        return candidates
+
     def decode(
         self,
         prediction_mode: PredictionMode,
@@ -107,18 +153,23 @@ class Block:
         self.reconstruction += self.prediction
         self.reconstruction = np.clip(self.reconstruction, 0, 255).astype("uint8")
 
+    def add_prediction(
+        self,
+        prediction_mode: PredictionMode,
+        prediction_calculator: "predictor.Predictor",
+    ):
+        self.predict(prediction_mode, prediction_calculator)
+        self.reconstruction = np.clip(
+            self.reconstruction + self.prediction, 0, 255
+        ).astype("uint8")
+
     def sort_q_indexes(self, prediction_mode: PredictionMode, decode=False):
-        if (
-            prediction_mode == PredictionMode.DC_PREDICTION
-            or prediction_mode == PredictionMode.PLANAR_PREDICTION
-        ):
-            self.q_indexes = (
-                invert_diagonal_sort(self.q_indexes)
-                if decode
-                else sort_diagonal(self.q_indexes)
-            )
-        elif prediction_mode == PredictionMode.HORIZONTAL_PREDICTION:
-            self.q_indexes = self.q_indexes.T
+        forward, inverse = scan_order(SCAN_ORDERS[prediction_mode], self.block_size)
+        self.q_indexes = (
+            self.q_indexes.ravel()[inverse].reshape(self.block_size, self.block_size)
+            if decode
+            else self.q_indexes.ravel()[forward]
+        )
 
     def distortion(self) -> np.array:
         return np.sum(
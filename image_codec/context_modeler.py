@@ -3,31 +3,65 @@ import numpy as np
 from typing import List
 
 from .probability_model import ProbabilityModel
+from .scan_order import scan_order
 
 
 class ContextModeler:
+
+    CODED_BLOCK_FLAG = 0
+    LAST_PREFIX = 1
+    PREDICTION_MODE_BIT1 = 2
+    PREDICTION_MODE_BIT2 = 3
+    PREDICTION_MODE_BIT3 = 4
+    PARTITIONING_MODE_BIT = 5
+    SIGNAL_FLAG = 6
+    GT1_FLAG = 9
+    LEVEL_PREFIX = 12
+    N_CONTEXT_CLASSES = 3
+    N_CONTEXTS = 15
+
     def __init__(self, block_size: int):
+        self.states = bytearray(self.N_CONTEXTS)
         self.probability_signal_flag = None
         self.probability_gt1_flag = None
         self.probability_level_prefix = None
-        self.probability_coded_block_flag = ProbabilityModel()
-        self.probability_last_prefix = ProbabilityModel()
-        self.prediction_mode_bit1 = ProbabilityModel()
-        self.prediction_mode_bit2 = ProbabilityModel()
-        self.prediction_mode_bit3 = ProbabilityModel()
-        self.partitioning_mode_bit = ProbabilityModel()
-        self.probability_models_signal_flag = self.init_probability_models(3)
-        self.probability_models_gt1_flag = self.init_probability_models(3)
-        self.probability_models_level_prefix = self.init_probability_models(3)
+        self.probability_coded_block_flag = ProbabilityModel(
+            self.states, self.CODED_BLOCK_FLAG
+        )
+        self.probability_last_prefix = ProbabilityModel(self.states, self.LAST_PREFIX)
+        self.prediction_mode_bit1 = ProbabilityModel(
+            self.states, self.PREDICTION_MODE_BIT1
+        )
+        self.prediction_mode_bit2 = ProbabilityModel(
+            self.states, self.PREDICTION_MODE_BIT2
+        )
+        self.prediction_mode_bit3 = ProbabilityModel(
+            self.states, self.PREDICTION_MODE_BIT3
+        )
+        self.partitioning_mode_bit = ProbabilityModel(
+            self.states, self.PARTITIONING_MODE_BIT
+        )
+        self.probability_models_signal_flag = self.init_probability_models(
+            self.SIGNAL_FLAG
+        )
+        self.probability_models_gt1_flag = self.init_probability_models(self.GT1_FLAG)
+        self.probability_models_level_prefix = self.init_probability_models(
+            self.LEVEL_PREFIX
+        )
         self.diagonal_map = self.generate_diagonal_map(block_size)
+        self.context_classes = self.generate_context_classes(self.diagonal_map)
+        self.context_class_counts = self.generate_context_class_counts(
+            self.context_classes
+        )
+
+    def snapshot(self) -> bytes:
+        return bytes(self.states)
+
+    def restore(self, snapshot: bytes):
+        self.states[:] = snapshot
 
     def switch_context(self, index: int):
-        if self.diagonal_map[index] < 4:
-            probability_model_index = 0
-        elif self.diagonal_map[index] < 7:
-            probability_model_index = 1
-        else:
-            probability_model_index = 2
+        probability_model_index = self.context_classes[index]
 
         self.probability_signal_flag = self.probability_models_signal_flag[
             probability_model_index
@@ -39,25 +73,25 @@ class ContextModeler:
             probability_model_index
         ]
 
-    @staticmethod
-    def init_probability_models(n_probability_models: int) -> List[ProbabilityModel]:
+    def init_probability_models(self, offset: int) -> List[ProbabilityModel]:
         models = []
-        for _ in range(n_probability_models):
-            models.append(ProbabilityModel())
+        for index in range(self.N_CONTEXT_CLASSES):
+            models.append(ProbabilityModel(self.states, offset + index))
         return models
 
     @staticmethod
     def generate_diagonal_map(block_size: int) -> np.array:
-        diagonal_map = []
-        rows, columns = block_size, block_size
-
-        for line in range(1, rows + columns):
-            start_column = max(0, line - rows)
-            count = min(line, (columns - start_column), rows)
+        forward, _ = scan_order("diagonal", block_size)
+        return forward // block_size + forward % block_size
 
-            for j in range(0, count):
-                l = min(rows, line) - j - 1
-                r = start_column + j
-                diagonal_map.append(l + r)
+    @staticmethod
+    def generate_context_classes(diagonal_map: np.array) -> np.array:
+        return np.digitize(diagonal_map, [4, 7])
 
-        return np.array(diagonal_map)
+    @classmethod
+    def generate_context_class_counts(cls, context_classes: np.array) -> np.array:
+        counts = np.zeros([context_classes.size + 1, cls.N_CONTEXT_CLASSES], dtype=int)
+        counts[1:] = np.cumsum(
+            context_classes[:, np.newaxis] == np.arange(cls.N_CONTEXT_CLASSES), axis=0
+        )
+        return counts
@@ -12,8 +12,8 @@ class ArithmeticDecoder:
 
     def decode_bit(self, probability_model: ProbabilityModel) -> int:
         bit: int = probability_model.mps()
-        lps: int = ProbabilityModel.LPS_TABLE[probability_model.state()][
-            (self.range >> 6) - 4
+        lps: int = ProbabilityModel.LPS_TABLE[
+            (probability_model.state() << 2) + (self.range >> 6) - 4
         ]
 
         self.range -= lps
@@ -28,7 +28,7 @@ class ArithmeticDecoder:
 
                 if self.bits_needed == 0:
                     self.bits_needed = -8
-                    self.bit_pattern += self.bitstream.read_bits(8)
+                    self.bit_pattern += self.bitstream.read_byte()
 
             probability_model.update_mps()
         else:
@@ -39,7 +39,7 @@ class ArithmeticDecoder:
             self.bits_needed += n_bits
 
             if self.bits_needed >= 0:
-                self.bit_pattern += self.bitstream.read_bits(8) << self.bits_needed
+                self.bit_pattern += self.bitstream.read_byte() << self.bits_needed
                 self.bits_needed -= 8
 
             probability_model.update_lps()
@@ -59,7 +59,7 @@ class ArithmeticDecoder:
 
         if self.bits_needed >= 0:
             self.bits_needed = -8
-            self.bit_pattern += self.bitstream.read_bits(8)
+            self.bit_pattern += self.bitstream.read_byte()
 
         scaled_range: int = self.range << 7
 
@@ -75,7 +75,7 @@ class ArithmeticDecoder:
         while n_bits > 8:
             self.bit_pattern <<= 8
             self.bit_pattern += int(
-                self.bitstream.read_bits(8) << (8 + self.bits_needed)
+                self.bitstream.read_byte() << (8 + self.bits_needed)
             )
             scaled_range: int = self.range << 15
             for i in range(8):
@@ -91,7 +91,7 @@ class ArithmeticDecoder:
         self.bit_pattern <<= n_bits
 
         if self.bits_needed >= 0:
-            self.bit_pattern += int(self.bitstream.read_bits(8) << self.bits_needed)
+            self.bit_pattern += int(self.bitstream.read_byte() << self.bits_needed)
             self.bits_needed -= 8
 
         scaled_range: int = self.range << (n_bits + 7)
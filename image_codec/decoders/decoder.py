@@ -1,41 +1,141 @@
+import numpy as np
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Tuple
+
 from ..bitstreams.input import InputBitstream
-from .entropy import EntropyDecoder
 from ..parameters import MetaParameters
-from ..predictor import Predictor
-from ..transformer import Transformer
+from ..pgm import write_pgm
+from ..shared_array import SharedArray
+from ..tile import Tile
+from .tile import (
+    TileDecoder,
+    initialize_worker,
+    decode_worker_tile,
+    decode_worker_row,
+)
+from ..wavefront import Wavefront
 
 
-class Decoder:
-    def __init__(self, input_path: str, output_path: str):
-        self.input_bitstream = InputBitstream(input_path)
+class Decoder(TileDecoder):
+    def __init__(self, input_path: str, output_path: str, n_jobs: int = 1):
+        input_bitstream = InputBitstream(input_path)
+        meta_parameters = MetaParameters.decode(input_bitstream)
+        super().__init__(
+            input_bitstream, meta_parameters.build_frame(), meta_parameters
+        )
+        self.input_path = input_path
         self.output_path = output_path
-        self.meta_parameters = MetaParameters.decode(self.input_bitstream)
-        self.decoded_frame = self.meta_parameters.build_frame()
-        self.transformer = Transformer(self.meta_parameters.block_size)
-        self.predictor = Predictor(self.decoded_frame)
-        self.entropy_decoder = EntropyDecoder(
-            self.input_bitstream, self.meta_parameters.block_size
+        self.tiles = self.meta_parameters.build_tiles(self.decoded_frame)
+        self.substream_offsets = self.meta_parameters.substream_offsets(
+            self.input_bitstream.position
         )
+        self.n_jobs = n_jobs
 
     def decode(self):
-        for block in self.decoded_frame.blocks():
-            for parameters in self.entropy_decoder.decode_block(
-                block
-            ).prediction_mode_parameters_list:
-                parameters.block.decode(
-                    parameters.prediction_mode,
-                    self.predictor,
-                    self.meta_parameters.quality_parameter,
-                    self.transformer,
-                )
-                self.decoded_frame.update(parameters.block, use_reconstruction=True)
+        if self.meta_parameters.wavefront:
+            self.decode_rows(self.tiles[0])
+        else:
+            self.decode_tiles(self.tiles, self.substream_offsets)
 
         self.terminate()
         self.save()
 
+    def decode_region(self, x: int, y: int, width: int, height: int):
+        if (
+            x < 0
+            or y < 0
+            or width <= 0
+            or height <= 0
+            or x + width > self.meta_parameters.width
+            or y + height > self.meta_parameters.height
+        ):
+            raise Exception("Decoder: Region is outside of the frame.")
+
+        if self.meta_parameters.wavefront:
+            self.decode_rows(
+                self.tiles[0],
+                n_rows=-(-(y + height) // self.meta_parameters.block_size),
+            )
+        else:
+            tiles, substream_offsets = zip(
+                *[
+                    (tile, substream_offset)
+                    for tile, substream_offset in zip(
+                        self.tiles, self.substream_offsets
+                    )
+                    if tile.intersects(x, y, width, height)
+                ]
+            )
+            self.decode_tiles(tiles, substream_offsets)
+
+        self.terminate()
+        self.save(region=(x, y, width, height))
+
+    def decode_tiles(self, tiles: List[Tile], substream_offsets: List[int]):
+        if self.is_parallel(len(tiles)):
+            self.decode_in_parallel(decode_worker_tile, tiles, tiles, substream_offsets)
+        else:
+            for tile, substream_offset in zip(tiles, substream_offsets):
+                self.decode_tile(tile, substream_offset)
+
+    def decode_rows(self, tile: Tile, n_rows: int = None):
+        rows = self.decoded_frame.block_rows(tile)[:n_rows]
+        is_parallel = self.is_parallel(len(rows))
+
+        with Wavefront(
+            len(rows), self.meta_parameters.n_block_columns(), shared=is_parallel
+        ) as wavefront:
+            if is_parallel:
+                self.decode_in_parallel(
+                    decode_worker_row,
+                    rows,
+                    [tile] * len(rows),
+                    rows,
+                    self.substream_offsets,
+                    wavefront=wavefront,
+                )
+                return
+
+            self.wavefront = wavefront
+            for row, substream_offset in zip(rows, self.substream_offsets):
+                self.decode_row(tile, row, substream_offset)
+
+    def is_parallel(self, n_regions: int) -> bool:
+        return (
+            self.n_jobs > 1
+            and n_regions > 1
+            and isinstance(self.input_path, (str, os.PathLike))
+        )
+
+    def decode_in_parallel(
+        self,
+        function: Callable,
+        regions: List[Tile],
+        *arguments: List,
+        wavefront: Wavefront = None,
+    ):
+        with SharedArray(self.decoded_frame.data.shape, np.uint8) as output:
+            with ProcessPoolExecutor(
+                max_workers=min(self.n_jobs, len(regions)),
+                initializer=initialize_worker,
+                initargs=(self.input_path, output, self.meta_parameters, wavefront),
+            ) as executor:
+                list(executor.map(function, *arguments))
+
+            self.decoded_frame.data[...] = output.array
+
     def terminate(self):
-        self.entropy_decoder.terminate()
         self.input_bitstream.terminate()
 
-    def save(self):
-        self.decoded_frame.save(self.output_path)
+    def save(self, region: Tuple[int, int, int, int] = None):
+        if self.output_path is None:
+            return
+
+        if region is None:
+            self.decoded_frame.save(self.output_path)
+            return
+
+        x, y, width, height = region
+        write_pgm(self.output_path, self.decoded_frame[y : y + height, x : x + width])
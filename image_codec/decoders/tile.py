@@ -0,0 +1,140 @@
+import numpy as np
+
+from collections import defaultdict
+from typing import List
+
+from ..bitstreams.input import InputBitstream
+from ..block import SCAN_ORDERS
+from .entropy import EntropyDecoder
+from ..frame import Frame
+from ..parameters import MetaParameters, PartitioningModeParameters
+from ..predictor import Predictor
+from ..scan_order import scan_order
+from ..shared_array import SharedArray
+from ..tile import Tile
+from ..transformer import Transformer
+from ..wavefront import Wavefront
+
+
+class TileDecoder:
+    def __init__(
+        self,
+        input_bitstream: InputBitstream,
+        decoded_frame: Frame,
+        meta_parameters: MetaParameters,
+    ):
+        self.input_bitstream = input_bitstream
+        self.decoded_frame = decoded_frame
+        self.meta_parameters = meta_parameters
+        self.transformer = Transformer()
+        self.wavefront = None
+        self.predictor = None
+        self.entropy_decoder = None
+
+    def decode_tile(self, tile: Tile, substream_offset: int):
+        self.input_bitstream.seek(substream_offset)
+        self.predictor = Predictor(self.decoded_frame, tile)
+        self.entropy_decoder = EntropyDecoder(
+            self.input_bitstream, self.meta_parameters.block_size
+        )
+
+        parameters_list = [
+            self.entropy_decoder.decode_block(block)
+            for block in self.decoded_frame.blocks(tile)
+        ]
+        self.entropy_decoder.terminate()
+
+        self.decode_residuals(parameters_list)
+        for parameters in parameters_list:
+            self.add_predictions(parameters)
+
+    def decode_row(self, tile: Tile, row: Tile, substream_offset: int):
+        self.input_bitstream.seek(substream_offset)
+        self.predictor = Predictor(self.decoded_frame, tile)
+        self.entropy_decoder = EntropyDecoder(
+            self.input_bitstream, self.meta_parameters.block_size
+        )
+
+        self.wavefront.wait_snapshot(row.index)
+        snapshot = self.wavefront.inherited_snapshot(row.index)
+        if snapshot is not None:
+            self.entropy_decoder.context_modeler.restore(snapshot)
+
+        parameters_list = []
+        for column, block in enumerate(self.decoded_frame.blocks(row)):
+            parameters_list.append(self.entropy_decoder.decode_block(block))
+            self.wavefront.save_snapshot(
+                row.index, column, self.entropy_decoder.context_modeler
+            )
+        self.entropy_decoder.terminate()
+
+        self.decode_residuals(parameters_list)
+        for column, parameters in enumerate(parameters_list):
+            self.wavefront.wait(row.index, column)
+            self.add_predictions(parameters)
+            self.wavefront.update(row.index, column + 1)
+
+    def decode_residuals(self, parameters_list: List[PartitioningModeParameters]):
+        groups = defaultdict(list)
+        for parameters in parameters_list:
+            for (
+                prediction_mode_parameters
+            ) in parameters.prediction_mode_parameters_list:
+                groups[
+                    prediction_mode_parameters.block.block_size,
+                    prediction_mode_parameters.prediction_mode,
+                ].append(prediction_mode_parameters.block)
+
+        for (block_size, prediction_mode), blocks in groups.items():
+            _, inverse = scan_order(SCAN_ORDERS[prediction_mode], block_size)
+            q_indexes = (
+                np.stack([block.q_indexes for block in blocks])
+                .reshape(-1, block_size * block_size)[:, inverse]
+                .reshape(-1, block_size, block_size)
+            )
+            residuals = self.transformer.transform_backward_batch(
+                q_indexes * self.meta_parameters.quantization_step_size,
+                [prediction_mode],
+            )
+            for block, block_q_indexes, residual in zip(blocks, q_indexes, residuals):
+                block.q_indexes = block_q_indexes
+                block.reconstruction = residual
+
+    def add_predictions(self, parameters: PartitioningModeParameters):
+        for prediction_mode_parameters in parameters.prediction_mode_parameters_list:
+            prediction_mode_parameters.block.add_prediction(
+                prediction_mode_parameters.prediction_mode, self.predictor
+            )
+            self.decoded_frame.update(
+                prediction_mode_parameters.block, use_reconstruction=True
+            )
+
+
+WORKER_TILE_DECODER = None
+
+
+def initialize_worker(
+    input_path: str,
+    output: SharedArray,
+    meta_parameters: MetaParameters,
+    wavefront: Wavefront = None,
+):
+    global WORKER_TILE_DECODER
+    WORKER_TILE_DECODER = TileDecoder(
+        InputBitstream(input_path),
+        Frame(output.array, meta_parameters.block_size),
+        meta_parameters,
+    )
+    WORKER_TILE_DECODER.wavefront = wavefront
+
+
+def decode_worker_tile(tile: Tile, substream_offset: int):
+    WORKER_TILE_DECODER.decode_tile(tile, substream_offset)
+
+
+def decode_worker_row(tile: Tile, row: Tile, substream_offset: int):
+    try:
+        WORKER_TILE_DECODER.decode_row(tile, row, substream_offset)
+    except BaseException:
+        WORKER_TILE_DECODER.wavefront.fail()
+        raise
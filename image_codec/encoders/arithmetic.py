@@ -13,8 +13,8 @@ class ArithmeticEncoder:
         self.bits_left: int = 23
 
     def encode_bit(self, bit: int, probability_model: ProbabilityModel):
-        lps: int = ProbabilityModel.LPS_TABLE[probability_model.state()][
-            (self.range >> 6) & 3
+        lps: int = ProbabilityModel.LPS_TABLE[
+            (probability_model.state() << 2) + ((self.range >> 6) & 3)
         ]
         self.range -= lps
 
@@ -74,11 +74,11 @@ class ArithmeticEncoder:
                     carry: int = lead_byte >> 8
                     byte: int = self.buffered_byte + carry
                     self.buffered_byte = lead_byte & 255
-                    self.output_bitstream.write_bits(byte, 8)
+                    self.output_bitstream.write_byte(byte)
                     byte = (255 + carry) & 255
 
                     while self.n_buffered_bytes > 1:
-                        self.output_bitstream.write_bits(byte, 8)
+                        self.output_bitstream.write_byte(byte)
                         self.n_buffered_bytes -= 1
                 else:
                     self.n_buffered_bytes = 1
@@ -93,21 +93,45 @@ class ArithmeticEncoder:
         self.test_and_write_out()
 
         if (self.low >> (32 - self.bits_left)) > 0:
-            self.output_bitstream.write_bits(self.buffered_byte + 1, 8)
+            self.output_bitstream.write_byte(self.buffered_byte + 1)
 
             while self.n_buffered_bytes > 1:
-                self.output_bitstream.write_bits(0, 8)
+                self.output_bitstream.write_byte(0)
                 self.n_buffered_bytes -= 1
 
             self.low -= 1 << (32 - self.bits_left)
         else:
             if self.n_buffered_bytes > 0:
-                self.output_bitstream.write_bits(self.buffered_byte, 8)
+                self.output_bitstream.write_byte(self.buffered_byte)
 
             while self.n_buffered_bytes > 1:
-                self.output_bitstream.write_bits(255, 8)
+                self.output_bitstream.write_byte(255)
                 self.n_buffered_bytes -= 1
 
         self.output_bitstream.write_bits(self.low >> 8, 24 - self.bits_left)
         self.output_bitstream.write_bit(1)
         self.output_bitstream.align_byte()
+
+
+class ContextTracker:
+    def encode_bit(self, bit: int, probability_model: ProbabilityModel):
+        if bit != probability_model.mps():
+            probability_model.update_lps()
+        else:
+            probability_model.update_mps()
+
+    def encode_bits(
+        self, bit_pattern: int, n_bits: int, probability_model: ProbabilityModel
+    ):
+        while n_bits > 0:
+            n_bits -= 1
+            self.encode_bit((bit_pattern >> n_bits) & 1, probability_model)
+
+    def encode_bit_bypass(self, bit: int):
+        pass
+
+    def encode_bits_bypass(self, bit_pattern: int, n_bits: int):
+        pass
+
+    def terminate(self):
+        pass
@@ -1,21 +1,26 @@
-from tqdm import tqdm
+import numpy as np
 
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+
+from ..analysis import Analysis
 from ..bitstreams.output import OutputBitstream
-from ..block import Block
-from .entropy import EntropyEncoder
 from ..frame import Frame
-from ..modes import PartitioningMode, PredictionMode
-from ..parameters import (
-    PredictionModeParameters,
-    PartitioningModeParameters,
-    ParametersList,
-    MetaParameters,
+from ..parameters import MetaParameters
+from ..presets import SearchParameters, PRESETS, DEFAULT_PRESET
+from ..progress import Progress, progress_bar
+from ..shared_array import SharedArray
+from ..tile import Tile
+from .tile import (
+    TileEncoder,
+    initialize_worker,
+    encode_worker_tile,
+    encode_worker_row,
 )
-from ..predictor import Predictor
-from ..transformer import Transformer
+from ..wavefront import Wavefront
 
 
-class Encoder:
+class Encoder(TileEncoder):
     def __init__(
         self,
         input_path: str,
@@ -23,92 +28,150 @@ class Encoder:
         block_size: int,
         quality_parameter: int,
         reconstruction_path: str = None,
+        search_parameters: SearchParameters = None,
+        preset: str = DEFAULT_PRESET,
+        n_tile_columns: int = 1,
+        n_tile_rows: int = 1,
+        wavefront: bool = False,
+        n_jobs: int = 1,
+        frame: Frame = None,
+        show_progress: bool = True,
+        analysis_in_path: str = None,
+        analysis_out_path: str = None,
+        refine_margin: float = 0,
     ):
         self.output_bitstream = OutputBitstream(output_path)
-        self.frame = Frame.load(input_path, block_size)
-        self.meta_parameters = MetaParameters(
-            height=self.frame.height,
-            width=self.frame.width,
+        frame = frame if frame is not None else Frame.load(input_path, block_size)
+        meta_parameters = MetaParameters(
+            height=frame.height,
+            width=frame.width,
             block_size=block_size,
             quality_parameter=quality_parameter,
+            n_tile_columns=n_tile_columns,
+            n_tile_rows=n_tile_rows,
+            wavefront=wavefront,
         )
-        self.reconstructed_frame = self.meta_parameters.build_frame()
-        self.reconstruction_path = reconstruction_path
-        self.transformer = Transformer(self.meta_parameters.block_size)
-        self.predictor = Predictor(self.reconstructed_frame)
-        self.entropy_encoder = EntropyEncoder(
-            self.output_bitstream, self.meta_parameters.block_size
+        super().__init__(
+            frame,
+            meta_parameters.build_frame(),
+            meta_parameters,
+            search_parameters or PRESETS[preset],
         )
+        self.reconstruction_path = reconstruction_path
+        self.tiles = self.meta_parameters.build_tiles(self.frame)
+        self.n_jobs = n_jobs
+        self.show_progress = show_progress
+        self.analysis_out_path = analysis_out_path
+        self.refine_margin = refine_margin
+
+        if analysis_in_path:
+            self.analysis_in = Analysis.load(analysis_in_path)
+            self.analysis_in.validate(
+                block_size,
+                self.meta_parameters.n_block_rows(),
+                self.meta_parameters.n_block_columns(),
+            )
+        if analysis_out_path:
+            self.analysis_out = Analysis.empty(
+                block_size,
+                quality_parameter,
+                self.meta_parameters.n_block_rows(),
+                self.meta_parameters.n_block_columns(),
+            )
 
     def encode(self):
-        self.meta_parameters.encode(self.output_bitstream)
+        with progress_bar(
+            sum(tile.n_blocks(self.frame.block_size) for tile in self.tiles),
+            self.show_progress,
+        ) as progress:
+            if self.meta_parameters.wavefront:
+                substreams = self.encode_rows(self.tiles[0], progress)
+            elif self.n_jobs > 1 and len(self.tiles) > 1:
+                substreams = self.encode_in_parallel(
+                    encode_worker_tile, self.tiles, self.tiles, progress=progress
+                )
+            else:
+                substreams = [self.encode_tile(tile, progress) for tile in self.tiles]
 
-        for block in tqdm(self.frame.blocks()):
-            self.entropy_encoder.encode_block(self.find_optimal_parameters(block))
+        self.meta_parameters.substream_sizes = [
+            len(substream) for substream in substreams
+        ]
+        self.meta_parameters.encode(self.output_bitstream)
+        for substream in substreams:
+            self.output_bitstream.write_bytes(substream)
 
         self.terminate()
         self.save()
 
-    def terminate(self):
-        self.entropy_encoder.terminate()
-        self.output_bitstream.terminate()
+    def encode_rows(self, tile: Tile, progress: Progress = None) -> List[bytes]:
+        rows = self.frame.block_rows(tile)
+        is_parallel = self.n_jobs > 1 and len(rows) > 1
 
-    def save(self):
-        if self.reconstruction_path:
-            self.reconstructed_frame.save(self.reconstruction_path)
-
-    def find_optimal_parameters(self, block: Block) -> PartitioningModeParameters:
-        partitioning_modes_parameters = ParametersList()
-        for partitioning_mode in PartitioningMode:
-            partitioning_mode_parameters = PartitioningModeParameters(
-                0, partitioning_mode
-            )
-            for index, partition in enumerate(block.partitions(partitioning_mode)):
-                prediction_modes_parameters = ParametersList()
-                for prediction_mode in PredictionMode:
-                    partition.encode(
-                        prediction_mode,
-                        self.predictor,
-                        self.meta_parameters.quantization_step_size,
-                        self.transformer,
-                    )
-                    partition.estimate_bit_rate(
-                        partitioning_mode,
-                        prediction_mode,
-                        self.entropy_encoder,
-                        is_first_partition=index == 0,
-                    )
-                    cost = (
-                        partition.distortion()
-                        + self.meta_parameters.lagrange_multiplier
-                        * partition.bit_rate_estimation
-                    )
-
-                    prediction_modes_parameters.append(
-                        PredictionModeParameters(
-                            cost,
-                            prediction_mode,
-                            partition.copy(),
-                        )
-                    )
-                optimal_prediction_mode_parameters = (
-                    prediction_modes_parameters.optimal()
-                )
-                partitioning_mode_parameters.merge(optimal_prediction_mode_parameters)
-                self.reconstructed_frame.update(
-                    optimal_prediction_mode_parameters.block, use_reconstruction=True
+        with Wavefront(
+            len(rows), self.meta_parameters.n_block_columns(), shared=is_parallel
+        ) as wavefront:
+            if is_parallel:
+                return self.encode_in_parallel(
+                    encode_worker_row,
+                    rows,
+                    [tile] * len(rows),
+                    rows,
+                    wavefront=wavefront,
+                    progress=progress,
                 )
 
-            partitioning_modes_parameters.append(partitioning_mode_parameters)
-            self.reconstructed_frame.reset(block)
+            self.wavefront = wavefront
+            return [self.encode_row(tile, row, progress) for row in rows]
 
-        optimal_partitioning_modes_parameters = partitioning_modes_parameters.optimal()
+    def encode_in_parallel(
+        self,
+        function: Callable,
+        regions: List[Tile],
+        *arguments: List,
+        wavefront: Wavefront = None,
+        progress: Progress = None,
+    ) -> List[bytes]:
+        if self.analysis_out is not None:
+            self.analysis_out.share()
 
-        for (
-            prediction_mode_parameters
-        ) in optimal_partitioning_modes_parameters.prediction_mode_parameters_list:
-            self.reconstructed_frame.update(
-                prediction_mode_parameters.block, use_reconstruction=True
-            )
+        try:
+            with SharedArray.copy_of(self.frame.data) as source, SharedArray(
+                self.reconstructed_frame.data.shape, np.uint8
+            ) as reconstruction:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.n_jobs, len(regions)),
+                    initializer=initialize_worker,
+                    initargs=(
+                        source,
+                        reconstruction,
+                        self.meta_parameters,
+                        self.search_parameters,
+                        wavefront,
+                        self.analysis_in,
+                        self.analysis_out,
+                        self.refine_margin,
+                    ),
+                ) as executor:
+                    substreams = []
+                    for region, substream in zip(
+                        regions, executor.map(function, *arguments)
+                    ):
+                        substreams.append(substream)
+                        if progress is not None:
+                            progress.update(region.n_blocks(self.frame.block_size))
+
+                self.reconstructed_frame.data[...] = reconstruction.array
+        finally:
+            if self.analysis_out is not None:
+                self.analysis_out.unshare()
+
+        return substreams
 
-        return optimal_partitioning_modes_parameters
+    def terminate(self):
+        self.output_bitstream.terminate()
+
+    def save(self):
+        if self.reconstruction_path:
+            self.reconstructed_frame.save(self.reconstruction_path)
+        if self.analysis_out_path:
+            self.analysis_out.save(self.analysis_out_path)
@@ -1,19 +1,30 @@
 import numpy as np
-import copy
 
-from .arithmetic import ArithmeticEncoder
+from .arithmetic import ArithmeticEncoder, ContextTracker
+from .estimator import RateEstimator
 from ..bitstreams.output import OutputBitstream
 from ..context_modeler import ContextModeler
 from ..block import Block
-from ..modes import PartitioningMode, PredictionMode
+from ..modes import EstimationMode, PartitioningMode, PredictionMode
 from ..parameters import PartitioningModeParameters
 from ..utils import count_bits
 
 
 class EntropyEncoder:
-    def __init__(self, output_bitstream: OutputBitstream, block_size: int):
-        self.arithmetic_encoder = ArithmeticEncoder(output_bitstream)
+    def __init__(
+        self,
+        output_bitstream: OutputBitstream,
+        block_size: int,
+        estimation_mode: EstimationMode = EstimationMode.EXACT,
+    ):
+        self.arithmetic_encoder = (
+            ArithmeticEncoder(output_bitstream)
+            if output_bitstream is not None
+            else ContextTracker()
+        )
         self.context_modeler = ContextModeler(block_size)
+        self.rate_estimator = RateEstimator(self.context_modeler)
+        self.estimation_mode = estimation_mode
         self.estimated_bits = 0
 
     def encode_block(self, parameters: PartitioningModeParameters):
@@ -125,8 +136,16 @@ class EntropyEncoder:
         prediction_mode: PredictionMode,
         is_first_partition: bool = True,
     ) -> int:
+        if self.estimation_mode == EstimationMode.FAST:
+            return self.rate_estimator.estimate_block_bits(
+                block,
+                partitioning_mode,
+                prediction_mode,
+                is_first_partition=is_first_partition,
+            )
+
         self.estimated_bits = 0
-        original_context_modeler = copy.deepcopy(self.context_modeler)
+        snapshot = self.context_modeler.snapshot()
 
         if partitioning_mode == PartitioningMode.NON_SUB_PARTITIONING:
             self.estimated_bits += (
@@ -173,7 +192,7 @@ class EntropyEncoder:
             )
 
         self.estimate_q_indexes_bits(block.q_indexes)
-        self.context_modeler = original_context_modeler
+        self.context_modeler.restore(snapshot)
 
         return self.estimated_bits
 
@@ -0,0 +1,118 @@
+import numpy as np
+
+from typing import Tuple
+
+from ..context_modeler import ContextModeler
+from ..modes import PartitioningMode, PredictionMode
+from ..probability_model import ProbabilityModel
+
+BIT_COSTS = 0.000030517578125 * np.array(ProbabilityModel.ENTROPY_BITS)
+
+PREDICTION_MODE_BINS = {
+    PredictionMode.PLANAR_PREDICTION: ((ContextModeler.PREDICTION_MODE_BIT1, 0),),
+    PredictionMode.DC_PREDICTION: (
+        (ContextModeler.PREDICTION_MODE_BIT1, 1),
+        (ContextModeler.PREDICTION_MODE_BIT2, 0),
+    ),
+    PredictionMode.HORIZONTAL_PREDICTION: (
+        (ContextModeler.PREDICTION_MODE_BIT1, 1),
+        (ContextModeler.PREDICTION_MODE_BIT2, 1),
+        (ContextModeler.PREDICTION_MODE_BIT3, 0),
+    ),
+    PredictionMode.VERTICAL_PREDICTION: (
+        (ContextModeler.PREDICTION_MODE_BIT1, 1),
+        (ContextModeler.PREDICTION_MODE_BIT2, 1),
+        (ContextModeler.PREDICTION_MODE_BIT3, 1),
+    ),
+}
+
+
+class RateEstimator:
+    def __init__(self, context_modeler: ContextModeler):
+        self.context_modeler = context_modeler
+        self.states = np.frombuffer(context_modeler.states, dtype=np.uint8)
+
+    def bit_costs(self) -> Tuple[np.array, np.array]:
+        return BIT_COSTS[self.states], BIT_COSTS[self.states ^ 1]
+
+    def estimate_block_bits(
+        self,
+        block: "block.Block",
+        partitioning_mode: PartitioningMode,
+        prediction_mode: PredictionMode,
+        is_first_partition: bool = True,
+    ) -> float:
+        costs = self.bit_costs()
+        return self.estimate_mode_bits(
+            partitioning_mode, prediction_mode, is_first_partition, costs
+        ) + self.estimate_q_indexes_bits(block.q_indexes, costs)
+
+    def estimate_mode_bits(
+        self,
+        partitioning_mode: PartitioningMode,
+        prediction_mode: PredictionMode,
+        is_first_partition: bool = True,
+        costs: Tuple[np.array, np.array] = None,
+    ) -> float:
+        costs = costs if costs is not None else self.bit_costs()
+        estimated_bits = 0.0
+
+        if (
+            partitioning_mode == PartitioningMode.NON_SUB_PARTITIONING
+            or is_first_partition
+        ):
+            estimated_bits += costs[partitioning_mode][
+                ContextModeler.PARTITIONING_MODE_BIT
+            ]
+
+        for context, binary in PREDICTION_MODE_BINS[prediction_mode]:
+            estimated_bits += costs[binary][context]
+
+        return float(estimated_bits)
+
+    def estimate_q_indexes_bits(
+        self, q_indexes: np.array, costs: Tuple[np.array, np.array] = None
+    ) -> float:
+        zero_costs, one_costs = costs if costs is not None else self.bit_costs()
+        q_indexes = q_indexes.ravel()
+        non_zero_indexes = np.flatnonzero(q_indexes)
+
+        if not non_zero_indexes.size:
+            return zero_costs[ContextModeler.CODED_BLOCK_FLAG]
+
+        last_scan_index = int(non_zero_indexes[-1])
+        class_index = (last_scan_index + 1).bit_length() - 1
+        estimated_bits = (
+            one_costs[ContextModeler.CODED_BLOCK_FLAG]
+            + class_index * (1 + zero_costs[ContextModeler.LAST_PREFIX])
+            + one_costs[ContextModeler.LAST_PREFIX]
+        )
+
+        signal_flags = slice(ContextModeler.SIGNAL_FLAG, ContextModeler.GT1_FLAG)
+        gt1_flags = slice(ContextModeler.GT1_FLAG, ContextModeler.LEVEL_PREFIX)
+        level_prefixes = slice(ContextModeler.LEVEL_PREFIX, ContextModeler.N_CONTEXTS)
+
+        levels = np.abs(q_indexes[non_zero_indexes])
+        context_classes = self.context_modeler.context_classes[non_zero_indexes]
+        is_gt1 = levels > 1
+
+        n_non_zero = np.bincount(context_classes[:-1], minlength=3)
+        n_zero = self.context_modeler.context_class_counts[last_scan_index] - n_non_zero
+        n_gt1 = np.bincount(context_classes[is_gt1], minlength=3)
+        n_eq1 = np.bincount(context_classes, minlength=3) - n_gt1
+        level_class_indexes = np.bincount(
+            context_classes[is_gt1],
+            weights=np.frexp(levels[is_gt1] - 1)[1] - 1,
+            minlength=3,
+        )
+
+        estimated_bits += (
+            n_zero @ zero_costs[signal_flags]
+            + n_non_zero @ one_costs[signal_flags]
+            + n_eq1 @ zero_costs[gt1_flags]
+            + n_gt1 @ (one_costs[gt1_flags] + one_costs[level_prefixes])
+            + level_class_indexes @ (1 + zero_costs[level_prefixes])
+            + non_zero_indexes.size
+        )
+
+        return float(estimated_bits)
@@ -0,0 +1,103 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+from .encoder import Encoder
+from ..frame import Frame
+from ..shared_array import SharedArray
+
+WORKER_FRAME = None
+
+
+def ladder_path(path: str, quality_parameter: int) -> str:
+    if "{qp}" in path:
+        return path.replace("{qp}", str(quality_parameter))
+
+    root, extension = os.path.splitext(path)
+    return f"{root}_qp{quality_parameter}{extension}"
+
+
+def encode_ladder(
+    input_path: str,
+    output_path: str,
+    block_size: int,
+    quality_parameters: Sequence[int],
+    reconstruction_path: str = None,
+    n_jobs: int = 1,
+    analysis_out_path: str = None,
+    **encoder_arguments,
+) -> List[str]:
+    frame = Frame.load(input_path, block_size)
+    quality_parameters = list(dict.fromkeys(quality_parameters))
+    rungs = [
+        (
+            quality_parameter,
+            ladder_path(output_path, quality_parameter),
+            reconstruction_path and ladder_path(reconstruction_path, quality_parameter),
+            analysis_out_path and ladder_path(analysis_out_path, quality_parameter),
+        )
+        for quality_parameter in quality_parameters
+    ]
+
+    if n_jobs <= 1 or len(rungs) <= 1:
+        for rung in rungs:
+            encode_rung(frame, *rung, encoder_arguments)
+    else:
+        with SharedArray.copy_of(frame.data[: frame.height, : frame.width]) as source:
+            with ProcessPoolExecutor(
+                max_workers=min(n_jobs, len(rungs)),
+                initializer=initialize_worker,
+                initargs=(source, block_size),
+            ) as executor:
+                list(
+                    executor.map(
+                        encode_worker_rung,
+                        *zip(*rungs),
+                        [encoder_arguments] * len(rungs),
+                    )
+                )
+
+    return [output_path for _, output_path, _, _ in rungs]
+
+
+def encode_rung(
+    frame: Frame,
+    quality_parameter: int,
+    output_path: str,
+    reconstruction_path: str,
+    analysis_out_path: str,
+    encoder_arguments: Dict,
+):
+    Encoder(
+        None,
+        output_path,
+        frame.block_size,
+        quality_parameter,
+        reconstruction_path,
+        frame=frame,
+        analysis_out_path=analysis_out_path,
+        **encoder_arguments,
+    ).encode()
+
+
+def initialize_worker(source: SharedArray, block_size: int):
+    global WORKER_FRAME
+    WORKER_FRAME = Frame(source.array, block_size)
+
+
+def encode_worker_rung(
+    quality_parameter: int,
+    output_path: str,
+    reconstruction_path: str,
+    analysis_out_path: str,
+    encoder_arguments: Dict,
+):
+    encode_rung(
+        WORKER_FRAME,
+        quality_parameter,
+        output_path,
+        reconstruction_path,
+        analysis_out_path,
+        {**encoder_arguments, "n_jobs": 1, "show_progress": False},
+    )
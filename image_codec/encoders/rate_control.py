@@ -0,0 +1,174 @@
+import dataclasses
+import io
+import math
+import os
+import time
+
+from typing import Dict, Optional
+
+from ..analysis import Analysis
+from ..bitstreams.output import OutputBitstream
+from .encoder import Encoder
+from ..frame import Frame
+from ..modes import EstimationMode
+from ..parameters import MetaParameters
+from ..presets import SearchParameters, PRESETS, DEFAULT_PRESET
+from .tile import TileEncoder
+
+MIN_QUALITY_PARAMETER = 0
+MAX_QUALITY_PARAMETER = 31
+REFINE_MARGIN = 0.1
+
+
+@dataclasses.dataclass
+class RateControlResult:
+    quality_parameter: int
+    target_bytes: int
+    n_bytes: int
+    n_probes: int
+    n_encodes: int
+    elapsed_time: float
+
+    def meets_target(self) -> bool:
+        return self.n_bytes <= self.target_bytes
+
+
+class RateController:
+    def __init__(
+        self,
+        frame: Frame,
+        search_parameters: SearchParameters,
+        n_tile_columns: int = 1,
+        n_tile_rows: int = 1,
+        wavefront: bool = False,
+    ):
+        self.frame = frame
+        self.search_parameters = dataclasses.replace(
+            search_parameters, estimation_mode=EstimationMode.FAST
+        )
+        self.n_tile_columns = n_tile_columns
+        self.n_tile_rows = n_tile_rows
+        self.wavefront = wavefront
+        self.estimations: Dict[int, float] = {}
+        self.analyses: Dict[int, Analysis] = {}
+
+    def estimate_bytes(self, quality_parameter: int) -> float:
+        if quality_parameter not in self.estimations:
+            meta_parameters = MetaParameters(
+                height=self.frame.height,
+                width=self.frame.width,
+                block_size=self.frame.block_size,
+                quality_parameter=quality_parameter,
+                n_tile_columns=self.n_tile_columns,
+                n_tile_rows=self.n_tile_rows,
+                wavefront=self.wavefront,
+            )
+            meta_parameters.substream_sizes = [0] * meta_parameters.n_substreams()
+            header = io.BytesIO()
+            output_bitstream = OutputBitstream(header)
+            meta_parameters.encode(output_bitstream)
+            output_bitstream.terminate()
+
+            tile_encoder = TileEncoder(
+                self.frame,
+                meta_parameters.build_frame(),
+                meta_parameters,
+                self.search_parameters,
+            )
+            tile_encoder.analysis_in = self.nearest_analysis(quality_parameter)
+            tile_encoder.analysis_out = Analysis.empty(
+                self.frame.block_size,
+                quality_parameter,
+                meta_parameters.n_block_rows(),
+                meta_parameters.n_block_columns(),
+            )
+            tile_encoder.refine_margin = REFINE_MARGIN
+            n_bits = sum(
+                tile_encoder.estimate_tile_bits(tile)
+                for tile in meta_parameters.build_tiles(self.frame)
+            )
+            self.estimations[quality_parameter] = len(header.getvalue()) + n_bits / 8
+            self.analyses[quality_parameter] = tile_encoder.analysis_out
+
+        return self.estimations[quality_parameter]
+
+    def nearest_analysis(self, quality_parameter: int) -> Optional[Analysis]:
+        if not self.analyses:
+            return None
+        return self.analyses[
+            min(self.analyses, key=lambda probe: abs(probe - quality_parameter))
+        ]
+
+    def find_quality_parameter(self, target_bytes: int) -> int:
+        low, high = MIN_QUALITY_PARAMETER, MAX_QUALITY_PARAMETER
+        while low < high:
+            quality_parameter = (low + high) // 2
+            if self.estimate_bytes(quality_parameter) <= target_bytes:
+                high = quality_parameter
+            else:
+                low = quality_parameter + 1
+
+        return high
+
+
+def encode_to_target(
+    input_path: str,
+    output_path: str,
+    block_size: int,
+    target_bytes: int = None,
+    target_bits_per_pixel: float = None,
+    reconstruction_path: str = None,
+    search_parameters: SearchParameters = None,
+    preset: str = DEFAULT_PRESET,
+    n_tile_columns: int = 1,
+    n_tile_rows: int = 1,
+    wavefront: bool = False,
+    **encoder_arguments,
+) -> RateControlResult:
+    start_time = time.perf_counter()
+    frame = Frame.load(input_path, block_size)
+    if target_bytes is None:
+        target_bytes = math.floor(
+            target_bits_per_pixel * frame.height * frame.width / 8
+        )
+
+    rate_controller = RateController(
+        frame,
+        search_parameters or PRESETS[preset],
+        n_tile_columns,
+        n_tile_rows,
+        wavefront,
+    )
+    quality_parameter = rate_controller.find_quality_parameter(target_bytes)
+
+    n_encodes = 0
+    while True:
+        Encoder(
+            None,
+            output_path,
+            block_size,
+            quality_parameter,
+            reconstruction_path,
+            search_parameters=search_parameters,
+            preset=preset,
+            n_tile_columns=n_tile_columns,
+            n_tile_rows=n_tile_rows,
+            wavefront=wavefront,
+            frame=frame,
+            **encoder_arguments,
+        ).encode()
+        n_encodes += 1
+        n_bytes = os.path.getsize(output_path)
+
+        if n_bytes <= target_bytes or quality_parameter == MAX_QUALITY_PARAMETER:
+            break
+        quality_parameter += 1
+
+    return RateControlResult(
+        quality_parameter=quality_parameter,
+        target_bytes=target_bytes,
+        n_bytes=n_bytes,
+        n_probes=len(rate_controller.estimations),
+        n_encodes=n_encodes,
+        elapsed_time=time.perf_counter() - start_time,
+    )
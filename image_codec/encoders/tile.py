@@ -0,0 +1,321 @@
+import io
+import math
+import numpy as np
+
+from typing import List, Tuple
+
+from ..analysis import Analysis
+from ..bitstreams.output import OutputBitstream
+from ..block import Block
+from .entropy import EntropyEncoder
+from ..frame import Frame
+from ..modes import PartitioningMode, PredictionMode
+from ..parameters import (
+    PredictionModeParameters,
+    PartitioningModeParameters,
+    ParametersList,
+    MetaParameters,
+)
+from ..predictor import Predictor
+from ..presets import SearchParameters
+from ..progress import Progress
+from ..shared_array import SharedArray
+from ..tile import Tile
+from ..transformer import Transformer
+from ..wavefront import Wavefront
+
+
+class TileEncoder:
+
+    N_TERMINATION_BITS = 10
+
+    def __init__(
+        self,
+        frame: Frame,
+        reconstructed_frame: Frame,
+        meta_parameters: MetaParameters,
+        search_parameters: SearchParameters,
+    ):
+        self.frame = frame
+        self.reconstructed_frame = reconstructed_frame
+        self.meta_parameters = meta_parameters
+        self.search_parameters = search_parameters
+        self.transformer = Transformer()
+        self.analysis_in = None
+        self.analysis_out = None
+        self.refine_margin = 0
+        self.wavefront = None
+        self.predictor = None
+        self.entropy_encoder = None
+
+    def encode_tile(self, tile: Tile, progress: Progress = None) -> bytes:
+        substream = io.BytesIO()
+        output_bitstream = OutputBitstream(substream)
+        self.start_substream(tile, output_bitstream)
+
+        for block in self.frame.blocks(tile):
+            self.encode_block(block)
+            if progress is not None:
+                progress.update()
+
+        self.finish_substream(output_bitstream)
+
+        return substream.getvalue()
+
+    def encode_row(self, tile: Tile, row: Tile, progress: Progress = None) -> bytes:
+        substream = io.BytesIO()
+        output_bitstream = OutputBitstream(substream)
+        self.wavefront.wait(row.index, 0)
+        self.start_substream(
+            tile, output_bitstream, self.wavefront.inherited_snapshot(row.index)
+        )
+
+        for column, block in enumerate(self.frame.blocks(row)):
+            self.wavefront.wait(row.index, column)
+            self.encode_block(block)
+            self.wavefront.advance(
+                row.index, column, self.entropy_encoder.context_modeler
+            )
+            if progress is not None:
+                progress.update()
+
+        self.finish_substream(output_bitstream)
+
+        return substream.getvalue()
+
+    def estimate_tile_bits(self, tile: Tile) -> float:
+        if not self.meta_parameters.wavefront:
+            return self.estimate_substream_bits(tile, tile)
+
+        rows = self.frame.block_rows(tile)
+        with Wavefront(len(rows), self.meta_parameters.n_block_columns()) as wavefront:
+            self.wavefront = wavefront
+            return sum(self.estimate_substream_bits(tile, row) for row in rows)
+
+    def estimate_substream_bits(self, tile: Tile, substream: Tile) -> float:
+        self.start_substream(
+            tile,
+            None,
+            (
+                self.wavefront.inherited_snapshot(substream.index)
+                if self.meta_parameters.wavefront
+                else None
+            ),
+        )
+
+        n_bits = 0
+        for column, block in enumerate(self.frame.blocks(substream)):
+            parameters = self.find_optimal_parameters(block)
+            self.entropy_encoder.encode_block(parameters)
+            n_bits += sum(
+                prediction_mode_parameters.block.bit_rate_estimation
+                for prediction_mode_parameters in parameters.prediction_mode_parameters_list
+            )
+            if self.meta_parameters.wavefront:
+                self.wavefront.advance(
+                    substream.index, column, self.entropy_encoder.context_modeler
+                )
+
+        return 8 * math.ceil((n_bits + self.N_TERMINATION_BITS) / 8)
+
+    def start_substream(
+        self, tile: Tile, output_bitstream: OutputBitstream, snapshot: bytes = None
+    ):
+        self.predictor = Predictor(self.reconstructed_frame, tile)
+        self.entropy_encoder = EntropyEncoder(
+            output_bitstream,
+            self.meta_parameters.block_size,
+            self.search_parameters.estimation_mode,
+        )
+
+        if snapshot is not None:
+            self.entropy_encoder.context_modeler.restore(snapshot)
+
+    def encode_block(self, block: Block):
+        self.entropy_encoder.encode_block(self.find_optimal_parameters(block))
+
+    def finish_substream(self, output_bitstream: OutputBitstream):
+        self.entropy_encoder.terminate()
+        output_bitstream.terminate()
+
+    def find_optimal_parameters(self, block: Block) -> PartitioningModeParameters:
+        decision = (
+            self.analysis_in.decision(block, self.refine_margin)
+            if self.analysis_in is not None
+            else None
+        )
+        partitioning_modes = (
+            [decision[0]]
+            if decision is not None
+            else self.search_parameters.partitioning_modes()
+        )
+
+        partitioning_modes_parameters = ParametersList()
+        prediction_margins = {}
+        for partitioning_mode in partitioning_modes:
+            partitioning_mode_parameters = PartitioningModeParameters(
+                0, partitioning_mode
+            )
+            prediction_margins[partitioning_mode] = math.inf
+            for index, partition in enumerate(block.partitions(partitioning_mode)):
+                prediction_modes_parameters = ParametersList()
+                if decision is not None:
+                    prediction_modes = decision[1][index : index + 1]
+                    predictions = self.predictor.get_prediction(
+                        partition, prediction_modes[0]
+                    )[np.newaxis]
+                else:
+                    prediction_modes, predictions = self.select_prediction_modes(
+                        partition, partitioning_mode, is_first_partition=index == 0
+                    )
+                candidates = partition.encode_candidates(
+                    prediction_modes,
+                    self.predictor,
+                    self.meta_parameters.quantization_step_size,
+                    self.transformer,
+                    predictions,
+                )
+                for prediction_mode, candidate in zip(prediction_modes, candidates):
+                    candidate.estimate_bit_rate(
+                        partitioning_mode,
+                        prediction_mode,
+                        self.entropy_encoder,
+                        is_first_partition=index == 0,
+                    )
+                    cost = (
+                        candidate.distortion()
+                        + self.meta_parameters.lagrange_multiplier
+                        * candidate.bit_rate_estimation
+                    )
+
+                    prediction_modes_parameters.append(
+                        PredictionModeParameters(cost, prediction_mode, candidate)
+                    )
+                optimal_prediction_mode_parameters = (
+                    prediction_modes_parameters.optimal()
+                )
+                partitioning_mode_parameters.merge(optimal_prediction_mode_parameters)
+                prediction_margins[partitioning_mode] = min(
+                    prediction_margins[partitioning_mode],
+                    prediction_modes_parameters.margin(),
+                )
+                self.reconstructed_frame.update(
+                    optimal_prediction_mode_parameters.block, use_reconstruction=True
+                )
+
+            partitioning_modes_parameters.append(partitioning_mode_parameters)
+            self.reconstructed_frame.reset(block)
+
+            if self.terminates_early(block, partitioning_mode_parameters):
+                break
+
+        optimal_partitioning_modes_parameters = partitioning_modes_parameters.optimal()
+
+        for (
+            prediction_mode_parameters
+        ) in optimal_partitioning_modes_parameters.prediction_mode_parameters_list:
+            self.reconstructed_frame.update(
+                prediction_mode_parameters.block, use_reconstruction=True
+            )
+
+        if self.analysis_out is not None:
+            self.analysis_out.record(
+                block,
+                optimal_partitioning_modes_parameters,
+                (
+                    self.analysis_in.margin(block)
+                    if decision is not None
+                    else min(
+                        partitioning_modes_parameters.margin(),
+                        prediction_margins[
+                            optimal_partitioning_modes_parameters.partitioning_mode
+                        ],
+                    )
+                ),
+            )
+
+        return optimal_partitioning_modes_parameters
+
+    def select_prediction_modes(
+        self,
+        partition: Block,
+        partitioning_mode: PartitioningMode,
+        is_first_partition: bool = True,
+    ) -> Tuple[List[PredictionMode], np.ndarray]:
+        predictions = self.predictor.get_predictions(partition)
+        prediction_modes = list(self.search_parameters.prediction_modes)
+
+        if (
+            not self.search_parameters.fast_mode_decision
+            or self.search_parameters.n_mode_candidates >= len(prediction_modes)
+        ):
+            return prediction_modes, predictions[prediction_modes]
+
+        satd_lagrange_multiplier = math.sqrt(self.meta_parameters.lagrange_multiplier)
+        satds = self.transformer.satd(partition.data.astype("int") - predictions)
+        costs = [
+            satds[prediction_mode]
+            + satd_lagrange_multiplier
+            * self.entropy_encoder.rate_estimator.estimate_mode_bits(
+                partitioning_mode, prediction_mode, is_first_partition
+            )
+            for prediction_mode in prediction_modes
+        ]
+        prediction_modes = [
+            prediction_mode
+            for _, prediction_mode in sorted(zip(costs, prediction_modes))
+        ][: max(1, self.search_parameters.n_mode_candidates)]
+
+        return prediction_modes, predictions[prediction_modes]
+
+    def terminates_early(
+        self, block: Block, partitioning_mode_parameters: PartitioningModeParameters
+    ) -> bool:
+        return (
+            self.search_parameters.early_termination
+            and partitioning_mode_parameters.partitioning_mode
+            == PartitioningMode.NON_SUB_PARTITIONING
+            and partitioning_mode_parameters.cost
+            < self.search_parameters.early_termination_threshold
+            * self.meta_parameters.lagrange_multiplier
+            * block.block_size
+            * block.block_size
+        )
+
+
+WORKER_TILE_ENCODER = None
+
+
+def initialize_worker(
+    source: SharedArray,
+    reconstruction: SharedArray,
+    meta_parameters: MetaParameters,
+    search_parameters: SearchParameters,
+    wavefront: Wavefront = None,
+    analysis_in: Analysis = None,
+    analysis_out: Analysis = None,
+    refine_margin: float = 0,
+):
+    global WORKER_TILE_ENCODER
+    WORKER_TILE_ENCODER = TileEncoder(
+        Frame(source.array, meta_parameters.block_size),
+        Frame(reconstruction.array, meta_parameters.block_size),
+        meta_parameters,
+        search_parameters,
+    )
+    WORKER_TILE_ENCODER.wavefront = wavefront
+    WORKER_TILE_ENCODER.analysis_in = analysis_in
+    WORKER_TILE_ENCODER.analysis_out = analysis_out
+    WORKER_TILE_ENCODER.refine_margin = refine_margin
+
+
+def encode_worker_tile(tile: Tile) -> bytes:
+    return WORKER_TILE_ENCODER.encode_tile(tile)
+
+
+def encode_worker_row(tile: Tile, row: Tile) -> bytes:
+    try:
+        return WORKER_TILE_ENCODER.encode_row(tile, row)
+    except BaseException:
+        WORKER_TILE_ENCODER.wavefront.fail()
+        raise
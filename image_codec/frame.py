@@ -3,6 +3,8 @@ import numpy as np
 from typing import List
 
 from .block import Block
+from .pgm import read_pgm, write_pgm
+from .tile import Tile
 
 
 class Frame:
@@ -20,13 +22,15 @@ class Frame:
             if self.width % self.block_size != 0
             else 0
         )
-        self.data = np.pad(
-            self.data, ((0, self.padding_height), (0, self.padding_width)), "edge"
-        )
-
-    def blocks(self) -> List[Block]:
-        for y in range(0, self.height + self.padding_height, self.block_size):
-            for x in range(0, self.width + self.padding_width, self.block_size):
+        if self.padding_height or self.padding_width:
+            self.data = np.pad(
+                self.data, ((0, self.padding_height), (0, self.padding_width)), "edge"
+            )
+
+    def blocks(self, tile: Tile = None) -> List[Block]:
+        tile = tile or self.tiles()[0]
+        for y in range(tile.y, tile.y + tile.height, self.block_size):
+            for x in range(tile.x, tile.x + tile.width, self.block_size):
                 yield Block(
                     x,
                     y,
@@ -34,6 +38,43 @@ class Frame:
                     self[y : y + self.block_size, x : x + self.block_size],
                 )
 
+    def tiles(self, n_tile_columns: int = 1, n_tile_rows: int = 1) -> List[Tile]:
+        n_block_columns = (self.width + self.padding_width) // self.block_size
+        n_block_rows = (self.height + self.padding_height) // self.block_size
+
+        if n_tile_columns > n_block_columns or n_tile_rows > n_block_rows:
+            raise Exception("Frame: Tile grid is finer than the block grid.")
+
+        columns = [
+            index * n_block_columns // n_tile_columns * self.block_size
+            for index in range(n_tile_columns + 1)
+        ]
+        rows = [
+            index * n_block_rows // n_tile_rows * self.block_size
+            for index in range(n_tile_rows + 1)
+        ]
+
+        return [
+            Tile(
+                row * n_tile_columns + column,
+                columns[column],
+                rows[row],
+                columns[column + 1] - columns[column],
+                rows[row + 1] - rows[row],
+            )
+            for row in range(n_tile_rows)
+            for column in range(n_tile_columns)
+        ]
+
+    def block_rows(self, tile: Tile = None) -> List[Tile]:
+        tile = tile or self.tiles()[0]
+        return [
+            Tile(index, tile.x, y, tile.width, self.block_size)
+            for index, y in enumerate(
+                range(tile.y, tile.y + tile.height, self.block_size)
+            )
+        ]
+
     def update(self, block: Block, use_reconstruction: bool = False):
         self[
             block.y : block.y + block.block_size, block.x : block.x + block.block_size
@@ -52,33 +93,12 @@ class Frame:
 
     @staticmethod
     def load(input_path: str, block_size: int) -> "frame.Frame":
-        with open(input_path, "rb") as file:
-            header = file.readline()
-
-            if header != b"P5\n":
-                raise Exception("Frame: Not an PGM image.")
-
-            size = file.readline()
-            max_value = file.readline()
-
-            if max_value != b"255\n":
-                raise Exception("Frame: PGM image has unexpected bit depth.")
-
-            width, height = str(size).split(" ")
-            width = int(width[2:])
-            height = int(height[: len(height) - 3])
-            data = np.zeros([height, width], dtype=np.uint8)
+        data, max_value = read_pgm(input_path)
 
-            for yi in range(0, height):
-                for xi in range(0, width):
-                    byte = file.read(1)
-                    if not byte:
-                        raise Exception("Frame: PGM image is corrupted.")
-                    data[yi, xi] = byte[0]
+        if max_value != 255:
+            raise Exception("Frame: PGM image has unexpected bit depth.")
 
-            return Frame(data, block_size)
+        return Frame(data, block_size)
 
     def save(self, output_path: str):
-        with open(output_path, "wb") as file:
-            file.write(f"P5\n{self.width} {self.height}\n255\n".encode())
-            file.write(self.data[: self.height, : self.width].ravel().tobytes())
+        write_pgm(output_path, self.data[: self.height, : self.width])
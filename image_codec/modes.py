@@ -11,3 +11,8 @@ class PredictionMode(IntEnum):
     VERTICAL_PREDICTION: int = 1
     HORIZONTAL_PREDICTION: int = 2
     PLANAR_PREDICTION: int = 3
+
+
+class EstimationMode(IntEnum):
+    EXACT: int = 0
+    FAST: int = 1
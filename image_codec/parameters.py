@@ -1,3 +1,6 @@
+import heapq
+import math
+import numbers
 import numpy as np
 
 from dataclasses import dataclass, field
@@ -8,6 +11,7 @@ from .bitstreams.output import OutputBitstream
 from .block import Block
 from .frame import Frame
 from .modes import PredictionMode, PartitioningMode
+from .tile import Tile
 
 
 @dataclass
@@ -45,6 +49,15 @@ class ParametersList:
     ) -> Union[Parameters, PredictionModeParameters, PartitioningModeParameters]:
         return min(self.parameters_list, key=lambda parameters: parameters.cost)
 
+    def margin(self) -> float:
+        if len(self.parameters_list) < 2:
+            return math.inf
+
+        best_cost, second_best_cost = heapq.nsmallest(
+            2, (parameters.cost for parameters in self.parameters_list)
+        )
+        return (second_best_cost - best_cost) / max(best_cost, 1)
+
     def __len__(self) -> int:
         return len(self.parameters_list)
 
@@ -55,38 +68,139 @@ class MetaParameters:
     N_BITS_HEIGHT = 16
     N_BITS_WIDTH = 16
     N_BITS_BLOCK_SIZE = 16
-    N_BITS_QUALITY_PARAMETER = 8
+    N_BITS_TILES_FLAG = 1
+    N_BITS_WAVEFRONT_FLAG = 1
+    N_BITS_QUALITY_PARAMETER = 6
+    N_BITS_TILE_COLUMNS = 16
+    N_BITS_TILE_ROWS = 16
+    N_BITS_SUBSTREAM_SIZE = 32
+    MAX_QUALITY_PARAMETER = 31
 
     def __init__(
-        self, height: int, width: int, block_size: int, quality_parameter: int
+        self,
+        height: int,
+        width: int,
+        block_size: int,
+        quality_parameter: int,
+        n_tile_columns: int = 1,
+        n_tile_rows: int = 1,
+        wavefront: bool = False,
+        substream_sizes: List[int] = None,
     ):
         self.height = height
         self.width = width
         self.block_size = block_size
         self.quality_parameter = quality_parameter
+        self.n_tile_columns = n_tile_columns
+        self.n_tile_rows = n_tile_rows
+        self.wavefront = wavefront
+        self.substream_sizes = substream_sizes
+
+        if not all(
+            isinstance(value, numbers.Integral) and not isinstance(value, bool)
+            for value in (self.quality_parameter, self.block_size)
+        ):
+            raise Exception(
+                "MetaParameters: Quality parameter and block size must be integers."
+            )
+        if not 0 <= self.quality_parameter <= self.MAX_QUALITY_PARAMETER:
+            raise Exception(
+                f"MetaParameters: Quality parameter must be in range 0,{self.MAX_QUALITY_PARAMETER}."
+            )
+        if not (
+            0 < self.height < 1 << self.N_BITS_HEIGHT
+            and 0 < self.width < 1 << self.N_BITS_WIDTH
+            and 0 < self.block_size < 1 << self.N_BITS_BLOCK_SIZE
+        ):
+            raise Exception(
+                "MetaParameters: Frame and block size must be in range 1,65535."
+            )
+        if self.wavefront and self.is_tiled():
+            raise Exception(
+                "MetaParameters: Wavefront parallel processing cannot be combined with tiles."
+            )
+
         self.quantization_step_size: float = 2 ** (self.quality_parameter / 4)
         self.lagrange_multiplier: float = (
             self.quantization_step_size * self.quantization_step_size
         )
 
+    def is_tiled(self) -> bool:
+        return self.n_tile_columns * self.n_tile_rows > 1
+
+    def n_block_rows(self) -> int:
+        return -(-self.height // self.block_size)
+
+    def n_block_columns(self) -> int:
+        return -(-self.width // self.block_size)
+
+    def n_substreams(self) -> int:
+        if self.wavefront:
+            return self.n_block_rows()
+        return self.n_tile_columns * self.n_tile_rows
+
     def encode(self, output_bitstream: OutputBitstream):
         output_bitstream.write_bits(self.height, self.N_BITS_HEIGHT)
         output_bitstream.write_bits(self.width, self.N_BITS_WIDTH)
         output_bitstream.write_bits(self.block_size, self.N_BITS_BLOCK_SIZE)
+        output_bitstream.write_bits(int(self.is_tiled()), self.N_BITS_TILES_FLAG)
+        output_bitstream.write_bits(int(self.wavefront), self.N_BITS_WAVEFRONT_FLAG)
         output_bitstream.write_bits(
             self.quality_parameter, self.N_BITS_QUALITY_PARAMETER
         )
 
+        if self.is_tiled():
+            output_bitstream.write_bits(self.n_tile_columns, self.N_BITS_TILE_COLUMNS)
+            output_bitstream.write_bits(self.n_tile_rows, self.N_BITS_TILE_ROWS)
+        if self.is_tiled() or self.wavefront:
+            for substream_size in self.substream_sizes:
+                output_bitstream.write_bits(substream_size, self.N_BITS_SUBSTREAM_SIZE)
+
+        output_bitstream.align_byte()
+
     @classmethod
     def decode(cls, input_bitstream: InputBitstream) -> "parameters.MetaParameters":
-        return cls(
-            height=input_bitstream.read_bits(cls.N_BITS_HEIGHT),
-            width=input_bitstream.read_bits(cls.N_BITS_WIDTH),
-            block_size=input_bitstream.read_bits(cls.N_BITS_BLOCK_SIZE),
-            quality_parameter=input_bitstream.read_bits(cls.N_BITS_QUALITY_PARAMETER),
+        height = input_bitstream.read_bits(cls.N_BITS_HEIGHT)
+        width = input_bitstream.read_bits(cls.N_BITS_WIDTH)
+        block_size = input_bitstream.read_bits(cls.N_BITS_BLOCK_SIZE)
+        is_tiled = input_bitstream.read_bits(cls.N_BITS_TILES_FLAG)
+        wavefront = bool(input_bitstream.read_bits(cls.N_BITS_WAVEFRONT_FLAG))
+        quality_parameter = input_bitstream.read_bits(cls.N_BITS_QUALITY_PARAMETER)
+        n_tile_columns, n_tile_rows = 1, 1
+
+        if is_tiled:
+            n_tile_columns = input_bitstream.read_bits(cls.N_BITS_TILE_COLUMNS)
+            n_tile_rows = input_bitstream.read_bits(cls.N_BITS_TILE_ROWS)
+
+        meta_parameters = cls(
+            height=height,
+            width=width,
+            block_size=block_size,
+            quality_parameter=quality_parameter,
+            n_tile_columns=n_tile_columns,
+            n_tile_rows=n_tile_rows,
+            wavefront=wavefront,
         )
+        if is_tiled or wavefront:
+            meta_parameters.substream_sizes = [
+                input_bitstream.read_bits(cls.N_BITS_SUBSTREAM_SIZE)
+                for _ in range(meta_parameters.n_substreams())
+            ]
+
+        input_bitstream.align_byte()
+
+        return meta_parameters
+
+    def substream_offsets(self, header_size: int) -> List[int]:
+        offsets = [header_size]
+        for substream_size in (self.substream_sizes or [])[:-1]:
+            offsets.append(offsets[-1] + substream_size)
+        return offsets
 
     def build_frame(self) -> Frame:
         return Frame(
             np.zeros([self.height, self.width], dtype=np.uint8), self.block_size
         )
+
+    def build_tiles(self, frame: Frame) -> List[Tile]:
+        return frame.tiles(self.n_tile_columns, self.n_tile_rows)
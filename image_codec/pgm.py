@@ -0,0 +1,136 @@
+import os
+import re
+import numpy as np
+
+from typing import BinaryIO, Tuple, Union
+
+HEADER_PATTERN = re.compile(
+    rb"(P[25])"
+    rb"(?:\s|#[^\r\n]*[\r\n])+(\d+)"
+    rb"(?:\s|#[^\r\n]*[\r\n])+(\d+)"
+    rb"(?:\s|#[^\r\n]*[\r\n])+(\d+)"
+    rb"\s"
+)
+HEADER_CHUNK_SIZE = 4096
+MAX_HEADER_SIZE = 1 << 16
+MAGIC_NUMBERS = (b"P2", b"P5")
+MAX_VALUE = 65535
+
+
+class Header:
+    def __init__(
+        self, magic_number: bytes, width: int, height: int, max_value: int, size: int
+    ):
+        self.magic_number = magic_number
+        self.width = width
+        self.height = height
+        self.max_value = max_value
+        self.size = size
+
+        if self.width <= 0 or self.height <= 0:
+            raise Exception("PGM: PGM image has invalid dimensions.")
+        if not 0 < self.max_value <= MAX_VALUE:
+            raise Exception("PGM: PGM image has unexpected bit depth.")
+
+    def is_binary(self) -> bool:
+        return self.magic_number == b"P5"
+
+    def dtype(self) -> np.dtype:
+        return sample_dtype(self.max_value)
+
+    def n_samples(self) -> int:
+        return self.width * self.height
+
+    @classmethod
+    def parse(cls, buffer: bytes) -> "pgm.Header":
+        match = HEADER_PATTERN.match(buffer[:MAX_HEADER_SIZE])
+        if match is None:
+            raise Exception("PGM: Not an PGM image.")
+        magic_number, width, height, max_value = match.groups()
+        return cls(magic_number, int(width), int(height), int(max_value), match.end())
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> "pgm.Header":
+        buffer = bytearray(file.read(HEADER_CHUNK_SIZE))
+        if not buffer.startswith(MAGIC_NUMBERS):
+            raise Exception("PGM: Not an PGM image.")
+
+        while len(buffer) < MAX_HEADER_SIZE and not HEADER_PATTERN.match(buffer):
+            chunk = file.read(HEADER_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+        return cls.parse(buffer)
+
+
+def sample_dtype(max_value: int) -> np.dtype:
+    return np.dtype(np.uint8) if max_value < 256 else np.dtype(">u2")
+
+
+def read_pgm(source: Union[str, os.PathLike, BinaryIO]) -> Tuple[np.ndarray, int]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            header = Header.read(file)
+            if not header.is_binary():
+                file.seek(header.size)
+                data = parse_ascii_raster(file.read())
+
+        if header.is_binary():
+            data = np.fromfile(
+                source,
+                dtype=header.dtype(),
+                count=header.n_samples(),
+                offset=header.size,
+            )
+    else:
+        buffer = source.read()
+        header = Header.parse(buffer)
+        if header.is_binary():
+            data = np.frombuffer(
+                buffer,
+                dtype=header.dtype(),
+                count=min(
+                    header.n_samples(),
+                    (len(buffer) - header.size) // header.dtype().itemsize,
+                ),
+                offset=header.size,
+            )
+        else:
+            data = parse_ascii_raster(memoryview(buffer)[header.size :])
+
+    if data.size < header.n_samples():
+        raise Exception("PGM: PGM image is corrupted.")
+
+    data = data[: header.n_samples()].reshape(header.height, header.width)
+    if data.max() > header.max_value:
+        raise Exception("PGM: PGM image has samples above its maximum value.")
+
+    return data.astype(header.dtype().newbyteorder("="), copy=False), header.max_value
+
+
+def parse_ascii_raster(raster: bytes) -> np.ndarray:
+    try:
+        data = np.array(bytes(raster).split(), dtype=np.int64)
+    except ValueError:
+        raise Exception("PGM: PGM image is corrupted.")
+    if data.size and data.min() < 0:
+        raise Exception("PGM: PGM image is corrupted.")
+    return data
+
+
+def write_pgm(
+    destination: Union[str, os.PathLike, BinaryIO],
+    data: np.ndarray,
+    max_value: int = 255,
+):
+    height, width = data.shape
+    raster = np.ascontiguousarray(data, dtype=sample_dtype(max_value))
+    header = f"P5\n{width} {height}\n{max_value}\n".encode()
+
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "wb") as file:
+            file.write(header)
+            file.write(memoryview(raster).cast("B"))
+    else:
+        destination.write(header)
+        destination.write(memoryview(raster).cast("B"))
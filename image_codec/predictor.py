@@ -1,20 +1,32 @@
 import numpy as np
 
+from functools import lru_cache
+from typing import Tuple
+
 from .block import Block
 from .frame import Frame
 from .modes import PredictionMode
+from .tile import Tile
 
 
 class Predictor:
-    def __init__(self, frame: Frame):
+    def __init__(self, frame: Frame, tile: Tile = None):
         self.frame = frame
+        self.x_origin = tile.x if tile else 0
+        self.y_origin = tile.y if tile else 0
+
+    def has_left_border(self, block: Block) -> bool:
+        return block.x > self.x_origin
+
+    def has_top_border(self, block: Block) -> bool:
+        return block.y > self.y_origin
 
     def left_border(self, block: Block) -> np.array:
         return (
             self.frame[
                 block.y : block.y + block.block_size, block.x - 1 : block.x
             ].ravel()
-            if block.x > 0
+            if self.has_left_border(block)
             else np.full([block.block_size], 128)
         )
 
@@ -23,10 +35,31 @@ class Predictor:
             self.frame[
                 block.y - 1 : block.y, block.x : block.x + block.block_size
             ].ravel()
-            if block.y > 0
+            if self.has_top_border(block)
             else np.full([block.block_size], 128)
         )
 
+    def neighbors(self, block: Block) -> Tuple[np.ndarray, np.ndarray]:
+        return (
+            self.left_border(block).astype("int"),
+            self.top_border(block).astype("int"),
+        )
+
+    def get_predictions(self, block: Block) -> np.ndarray:
+        left_samples, top_samples = self.neighbors(block)
+        predictions = np.empty(
+            [len(PredictionMode), block.block_size, block.block_size], dtype="int"
+        )
+        predictions[PredictionMode.DC_PREDICTION] = self.dc_value(
+            block, left_samples, top_samples
+        )
+        predictions[PredictionMode.VERTICAL_PREDICTION] = top_samples
+        predictions[PredictionMode.HORIZONTAL_PREDICTION] = left_samples[:, np.newaxis]
+        predictions[PredictionMode.PLANAR_PREDICTION] = self.planar(
+            left_samples, top_samples
+        )
+        return predictions
+
     def get_prediction(
         self, block: Block, prediction_mode: PredictionMode
     ) -> np.ndarray:
@@ -40,16 +73,10 @@ class Predictor:
             return self.get_planar_prediction(block)
 
     def get_dc_prediction(self, block: Block) -> np.ndarray:
-        dc = 128
-        if block.x > 0 and block.y > 0:
-            dc = round(
-                0.5 * (self.left_border(block).mean() + self.top_border(block).mean())
-            )
-        elif block.x > 0:
-            dc = round(self.left_border(block).mean())
-        elif block.y > 0:
-            dc = round(self.top_border(block).mean())
-        return np.full([block.block_size, block.block_size], dc)
+        return np.full(
+            [block.block_size, block.block_size],
+            self.dc_value(block, *self.neighbors(block)),
+        )
 
     def get_vertical_prediction(self, block: Block) -> np.ndarray:
         return np.full([block.block_size, block.block_size], self.top_border(block))
@@ -58,30 +85,41 @@ class Predictor:
         return np.full([block.block_size, block.block_size], self.left_border(block)).T
 
     def get_planar_prediction(self, block: Block) -> np.ndarray:
-        top_samples = self.top_border(block).astype("int")
-        left_samples = self.left_border(block).astype("int")
-
-        virtual_bottom_samples = np.full(
-            [block.block_size], left_samples[block.block_size - 1]
-        )
-        virtual_right_samples = np.full(
-            [block.block_size], top_samples[block.block_size - 1]
-        )
+        return self.planar(*self.neighbors(block))
 
-        prediction = np.full(
-            [block.block_size, block.block_size], block.block_size, dtype="int32"
+    def dc_value(
+        self, block: Block, left_samples: np.ndarray, top_samples: np.ndarray
+    ) -> int:
+        dc = 128
+        if self.has_left_border(block) and self.has_top_border(block):
+            dc = round(0.5 * (left_samples.mean() + top_samples.mean()))
+        elif self.has_left_border(block):
+            dc = round(left_samples.mean())
+        elif self.has_top_border(block):
+            dc = round(top_samples.mean())
+        return dc
+
+    @staticmethod
+    def planar(left_samples: np.ndarray, top_samples: np.ndarray) -> np.ndarray:
+        block_size = left_samples.size
+        decreasing_weights, increasing_weights = planar_weights(block_size)
+
+        prediction = (
+            np.outer(left_samples, decreasing_weights)
+            + np.outer(decreasing_weights, top_samples)
+            + top_samples[-1] * increasing_weights[np.newaxis, :]
+            + left_samples[-1] * increasing_weights[:, np.newaxis]
+            + block_size
         )
+        prediction //= 2 * block_size
 
-        for local_x in range(0, block.block_size):
-            prediction[:, local_x] += (
-                block.block_size - 1 - local_x
-            ) * left_samples + (1 + local_x) * virtual_right_samples
-
-        for local_y in range(0, block.block_size):
-            prediction[local_y, :] += (block.block_size - 1 - local_y) * top_samples + (
-                1 + local_y
-            ) * virtual_bottom_samples
+        return prediction
 
-        prediction //= 2 * block.block_size
 
-        return prediction
+@lru_cache(maxsize=None)
+def planar_weights(block_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    decreasing_weights = np.arange(block_size - 1, -1, -1)
+    increasing_weights = np.arange(1, block_size + 1)
+    decreasing_weights.setflags(write=False)
+    increasing_weights.setflags(write=False)
+    return decreasing_weights, increasing_weights
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from .modes import EstimationMode, PredictionMode, PartitioningMode
+
+
+@dataclass
+class SearchParameters:
+    prediction_modes: Tuple[PredictionMode, ...] = tuple(PredictionMode)
+    sub_partitioning: bool = True
+    estimation_mode: EstimationMode = EstimationMode.EXACT
+    fast_mode_decision: bool = False
+    n_mode_candidates: int = 2
+    early_termination: bool = False
+    early_termination_threshold: float = 0.1
+
+    def partitioning_modes(self) -> List[PartitioningMode]:
+        return (
+            list(PartitioningMode)
+            if self.sub_partitioning
+            else [PartitioningMode.NON_SUB_PARTITIONING]
+        )
+
+
+PRESETS: Dict[str, SearchParameters] = {
+    "ultrafast": SearchParameters(
+        sub_partitioning=False,
+        estimation_mode=EstimationMode.FAST,
+        fast_mode_decision=True,
+        n_mode_candidates=1,
+    ),
+    "fast": SearchParameters(
+        estimation_mode=EstimationMode.FAST,
+        fast_mode_decision=True,
+        n_mode_candidates=2,
+        early_termination=True,
+    ),
+    "medium": SearchParameters(
+        fast_mode_decision=True,
+        n_mode_candidates=2,
+        early_termination=True,
+    ),
+    "slow": SearchParameters(),
+}
+DEFAULT_PRESET = "slow"
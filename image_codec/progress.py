@@ -0,0 +1,21 @@
+import contextlib
+
+from typing import ContextManager, Optional, Protocol
+
+
+class Progress(Protocol):
+    def update(self, n: int = 1): ...
+
+
+def progress_bar(
+    total: int, enabled: bool = True
+) -> ContextManager[Optional[Progress]]:
+    if enabled:
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            pass
+        else:
+            return tqdm(total=total)
+
+    return contextlib.nullcontext()
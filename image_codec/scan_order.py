@@ -0,0 +1,49 @@
+import numpy as np
+
+from typing import Callable, Dict, Tuple
+
+SCAN_GENERATORS: Dict[str, Callable[[int], np.ndarray]] = {}
+SCAN_ORDERS: Dict[Tuple[str, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def register_scan(name: str) -> Callable:
+    def register(generator: Callable[[int], np.ndarray]) -> Callable:
+        SCAN_GENERATORS[name] = generator
+        return generator
+
+    return register
+
+
+def scan_order(name: str, block_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    key = (name, block_size)
+    if key not in SCAN_ORDERS:
+        forward = SCAN_GENERATORS[name](block_size)
+        inverse = np.empty_like(forward)
+        inverse[forward] = np.arange(forward.size)
+        forward.setflags(write=False)
+        inverse.setflags(write=False)
+        SCAN_ORDERS[key] = forward, inverse
+    return SCAN_ORDERS[key]
+
+
+@register_scan("diagonal")
+def diagonal_scan(block_size: int) -> np.ndarray:
+    rows, columns = np.indices([block_size, block_size]).reshape(2, -1)
+    return np.lexsort((columns, rows + columns))
+
+
+@register_scan("horizontal")
+def horizontal_scan(block_size: int) -> np.ndarray:
+    return np.arange(block_size * block_size)
+
+
+@register_scan("vertical")
+def vertical_scan(block_size: int) -> np.ndarray:
+    return np.arange(block_size * block_size).reshape(block_size, block_size).T.ravel()
+
+
+@register_scan("zigzag")
+def zigzag_scan(block_size: int) -> np.ndarray:
+    rows, columns = np.indices([block_size, block_size]).reshape(2, -1)
+    diagonals = rows + columns
+    return np.lexsort((np.where(diagonals % 2, rows, -rows), diagonals))
@@ -0,0 +1,195 @@
+import io
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from .api import encode_file, decode_file
+
+PREFIX_FORMAT = ">II"
+PREFIX_SIZE = struct.calcsize(PREFIX_FORMAT)
+ENCODE_OPTIONS = {
+    "block_size",
+    "quality_parameter",
+    "preset",
+    "n_tile_columns",
+    "n_tile_rows",
+    "wavefront",
+}
+DECODE_OPTIONS = {"region"}
+
+Message = Tuple[Dict, bytes]
+
+
+def read_exactly(file: BinaryIO, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = file.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+def read_frame(file: BinaryIO) -> Optional[Tuple[bytes, bytes]]:
+    prefix = read_exactly(file, PREFIX_SIZE)
+    if not prefix:
+        return None
+
+    if len(prefix) == PREFIX_SIZE:
+        header_size, body_size = struct.unpack(PREFIX_FORMAT, prefix)
+        header = read_exactly(file, header_size)
+        body = read_exactly(file, body_size)
+        if len(header) == header_size and len(body) == body_size:
+            return header, body
+
+    raise Exception("Server: Unexpected end of stream.")
+
+
+def read_message(file: BinaryIO) -> Optional[Message]:
+    frame = read_frame(file)
+    if frame is None:
+        return None
+    return parse_header(frame[0]), frame[1]
+
+
+def parse_header(header: bytes) -> Dict:
+    try:
+        header = json.loads(header)
+    except ValueError:
+        raise Exception("Server: Header is not valid JSON.")
+    if not isinstance(header, dict):
+        raise Exception("Server: Header must be a JSON object.")
+    return header
+
+
+def write_message(file: BinaryIO, header: Dict, body: bytes = b""):
+    header = json.dumps(header).encode()
+    file.write(struct.pack(PREFIX_FORMAT, len(header), len(body)))
+    file.write(header)
+    file.write(body)
+    file.flush()
+
+
+def handle_request(header: bytes, body: bytes) -> Message:
+    try:
+        options = parse_header(header)
+        command = options.pop("command", None)
+        output = io.BytesIO()
+
+        if command == "encode":
+            validate_options(options, ENCODE_OPTIONS)
+            encode_file(io.BytesIO(body), output, **options)
+        elif command == "decode":
+            validate_options(options, DECODE_OPTIONS)
+            region = options.get("region")
+            decode_file(
+                io.BytesIO(body), output, region=tuple(region) if region else None
+            )
+        else:
+            raise Exception(f"Server: Unknown command {command!r}.")
+
+        return {"status": "ok"}, output.getvalue()
+    except Exception as exception:
+        return error_response(exception)
+
+
+def error_response(exception: Exception) -> Message:
+    return {
+        "status": "error",
+        "message": str(exception) or type(exception).__name__,
+    }, b""
+
+
+def collect_response(future: Future) -> Message:
+    try:
+        return future.result()
+    except Exception as exception:
+        return error_response(exception)
+
+
+def validate_options(options: Dict, valid_options: set):
+    invalid_options = set(options) - valid_options
+    if invalid_options:
+        raise Exception(
+            f"Server: Unknown options {', '.join(sorted(invalid_options))}."
+        )
+
+
+def request(socket_path: str, header: Dict, body: bytes = b"") -> Message:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        with client.makefile("rwb") as file:
+            write_message(file, header, body)
+            return read_message(file)
+
+
+class Server:
+    def __init__(self, n_jobs: int = 1):
+        self.n_jobs = n_jobs
+        self.executor = ProcessPoolExecutor(n_jobs) if n_jobs > 1 else None
+
+    def serve_stream(self, input_file: BinaryIO, output_file: BinaryIO):
+        if self.executor is None:
+            frame = read_frame(input_file)
+            while frame is not None:
+                write_message(output_file, *handle_request(*frame))
+                frame = read_frame(input_file)
+            return
+
+        futures = queue.Queue(2 * self.n_jobs)
+        writer = threading.Thread(
+            target=self.write_responses, args=(futures, output_file)
+        )
+        writer.start()
+        try:
+            frame = read_frame(input_file)
+            while frame is not None:
+                futures.put(self.executor.submit(handle_request, *frame))
+                frame = read_frame(input_file)
+        finally:
+            futures.put(None)
+            writer.join()
+
+    def write_responses(self, futures: queue.Queue, output_file: BinaryIO):
+        is_open = True
+        future = futures.get()
+        while future is not None:
+            if is_open:
+                try:
+                    write_message(output_file, *collect_response(future))
+                except OSError:
+                    is_open = False
+            future = futures.get()
+
+    def serve_socket(self, socket_path: str):
+        with socketserver.ThreadingUnixStreamServer(
+            socket_path, RequestHandler
+        ) as unix_server:
+            unix_server.daemon_threads = True
+            unix_server.codec_server = self
+            try:
+                unix_server.serve_forever()
+            finally:
+                os.unlink(socket_path)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def __enter__(self) -> "server.Server":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.codec_server.serve_stream(self.rfile, self.wfile)
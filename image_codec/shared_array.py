@@ -0,0 +1,51 @@
+import numpy as np
+
+from multiprocessing import shared_memory
+from typing import Tuple
+
+
+class SharedArray:
+    def __init__(self, shape: Tuple[int, ...], dtype: np.dtype, name: str = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+
+        if self.owner:
+            self.shared_memory = shared_memory.SharedMemory(
+                create=True, size=max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+            )
+        else:
+            self.shared_memory = attach_shared_memory(name)
+
+        self.array = np.ndarray(self.shape, self.dtype, buffer=self.shared_memory.buf)
+
+    @classmethod
+    def copy_of(cls, array: np.ndarray) -> "shared_array.SharedArray":
+        shared_array = cls(array.shape, array.dtype)
+        shared_array.array[...] = array
+        return shared_array
+
+    def close(self):
+        self.array = None
+        self.shared_memory.close()
+        if self.owner:
+            self.shared_memory.unlink()
+
+    def __enter__(self) -> "shared_array.SharedArray":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self) -> Tuple[Tuple[int, ...], str, str]:
+        return self.shape, self.dtype.str, self.shared_memory.name
+
+    def __setstate__(self, state: Tuple[Tuple[int, ...], str, str]):
+        self.__init__(*state)
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
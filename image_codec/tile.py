@@ -0,0 +1,18 @@
+class Tile:
+    def __init__(self, index: int, x: int, y: int, width: int, height: int):
+        self.index = index
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def n_blocks(self, block_size: int) -> int:
+        return (self.width // block_size) * (self.height // block_size)
+
+    def intersects(self, x: int, y: int, width: int, height: int) -> bool:
+        return (
+            self.x < x + width
+            and x < self.x + self.width
+            and self.y < y + height
+            and y < self.y + self.height
+        )
@@ -1,21 +1,70 @@
 import math
 import numpy as np
-from scipy.fftpack import dct, idct
+
+from functools import lru_cache
+from typing import Sequence, Tuple
 
 from .modes import PredictionMode
 
 
-class Transformer:
-    def __init__(self, block_size: int):
-        self.dst_vii_matrices = {
-            str(block_size): self.generate_dst_vii_matrix(block_size)
-            for block_size in [block_size, int(block_size / 2)]
-        }
-        self.dst_vii_inverse_matrices = {
-            str(block_size): self.dst_vii_matrices[str(block_size)].T
-            for block_size in [block_size, int(block_size / 2)]
-        }
+@lru_cache(maxsize=None)
+def dst_vii_matrix(block_size: int) -> np.ndarray:
+    matrix = Transformer.generate_dst_vii_matrix(block_size)
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(maxsize=None)
+def dct_ii_matrix(block_size: int) -> np.ndarray:
+    matrix = Transformer.generate_dct_ii_matrix(block_size)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def separable_matrices(
+    block_size: int, prediction_mode: PredictionMode
+) -> Tuple[np.ndarray, np.ndarray]:
+    if prediction_mode == PredictionMode.PLANAR_PREDICTION:
+        return dst_vii_matrix(block_size), dst_vii_matrix(block_size)
+    elif prediction_mode == PredictionMode.DC_PREDICTION:
+        return dct_ii_matrix(block_size), dct_ii_matrix(block_size)
+    elif prediction_mode == PredictionMode.HORIZONTAL_PREDICTION:
+        return dct_ii_matrix(block_size), dst_vii_matrix(block_size)
+    else:
+        return dst_vii_matrix(block_size), dct_ii_matrix(block_size)
+
+
+@lru_cache(maxsize=None)
+def transform_matrices(
+    block_size: int, prediction_modes: Tuple[PredictionMode, ...]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    column_matrices, row_matrices = zip(
+        *(
+            separable_matrices(block_size, prediction_mode)
+            for prediction_mode in prediction_modes
+        )
+    )
+    column_matrices = np.stack(column_matrices)
+    row_matrices = np.stack(row_matrices)
+    return (
+        column_matrices,
+        np.ascontiguousarray(row_matrices.transpose(0, 2, 1)),
+        np.ascontiguousarray(column_matrices.transpose(0, 2, 1)),
+        row_matrices,
+    )
 
+
+@lru_cache(maxsize=None)
+def hadamard_matrix(block_size: int) -> np.ndarray:
+    matrix = np.ones([1, 1])
+    while matrix.shape[0] < block_size:
+        matrix = np.block([[matrix, matrix], [matrix, -matrix]])
+    matrix /= math.sqrt(block_size)
+    matrix.setflags(write=False)
+    return matrix
+
+
+class Transformer:
     @staticmethod
     def generate_dst_vii_matrix(block_size):
         matrix = []
@@ -30,54 +79,66 @@ class Transformer:
             matrix.append(b_k)
         return np.asarray(matrix)
 
+    @staticmethod
+    def generate_dct_ii_matrix(block_size):
+        matrix = []
+        for k in range(block_size):
+            alpha = math.sqrt((1 if k == 0 else 2) / block_size)
+            b_k = []
+            for n in range(block_size):
+                b_k.append(
+                    alpha * math.cos(math.pi * ((2 * n + 1) / (2 * block_size)) * k)
+                )
+            matrix.append(b_k)
+        return np.asarray(matrix)
+
+    def transform_forward_batch(
+        self, prediction_errors: np.ndarray, prediction_modes: Sequence[PredictionMode]
+    ) -> np.ndarray:
+        left_matrices, right_matrices, _, _ = transform_matrices(
+            prediction_errors.shape[-1], tuple(prediction_modes)
+        )
+        return np.matmul(np.matmul(left_matrices, prediction_errors), right_matrices)
+
+    def transform_backward_batch(
+        self, reconstructions: np.ndarray, prediction_modes: Sequence[PredictionMode]
+    ) -> np.ndarray:
+        _, _, left_matrices, right_matrices = transform_matrices(
+            reconstructions.shape[-1], tuple(prediction_modes)
+        )
+        rec_residuals = np.matmul(
+            np.matmul(left_matrices, reconstructions), right_matrices
+        )
+        return np.rint(rec_residuals).astype(int)
+
+    @staticmethod
+    def satd(prediction_errors: np.ndarray) -> np.ndarray:
+        block_size = prediction_errors.shape[-1]
+        if block_size & (block_size - 1):
+            return np.abs(prediction_errors).sum(axis=(-2, -1))
+
+        matrix = hadamard_matrix(block_size)
+        return np.abs(np.matmul(np.matmul(matrix, prediction_errors), matrix)).sum(
+            axis=(-2, -1)
+        )
+
+    @staticmethod
+    def quantize(
+        transform_coefficients: np.ndarray, quality_parameter: float
+    ) -> np.ndarray:
+        return (
+            np.sign(transform_coefficients)
+            * np.floor((np.abs(transform_coefficients) / quality_parameter) + 0.4)
+        ).astype("int")
+
     def transform_forward(
         self, block: "block.Block", prediction_mode: PredictionMode
     ) -> np.array:
-        dst_vii_matrix_key = str(block.block_size)
-        dst_vii_matrix = self.dst_vii_matrices[dst_vii_matrix_key]
-        dst_vii_inverse_matrix = self.dst_vii_inverse_matrices[dst_vii_matrix_key]
-
-        if prediction_mode == PredictionMode.PLANAR_PREDICTION:
-            return np.matmul(
-                np.matmul(dst_vii_matrix, block.prediction_error),
-                dst_vii_inverse_matrix,
-            )
-        elif prediction_mode == PredictionMode.DC_PREDICTION:
-            return dct(
-                dct(block.prediction_error, axis=0, norm="ortho"), axis=1, norm="ortho"
-            )
-        elif prediction_mode == PredictionMode.HORIZONTAL_PREDICTION:
-            return np.matmul(
-                dct(block.prediction_error, axis=0, norm="ortho"),
-                dst_vii_inverse_matrix,
-            )
-        else:
-            return dct(
-                np.matmul(dst_vii_matrix, block.prediction_error), axis=1, norm="ortho"
-            )
+        return self.transform_forward_batch(
+            block.prediction_error[np.newaxis], [prediction_mode]
+        )[0]
 
     def transform_backward(self, block: "block.Block", prediction_mode: PredictionMode):
-        dst_vii_matrix_key = str(block.block_size)
-        dst_vii_matrix = self.dst_vii_matrices[dst_vii_matrix_key]
-        dst_vii_inverse_matrix = self.dst_vii_inverse_matrices[dst_vii_matrix_key]
-
-        if prediction_mode == PredictionMode.PLANAR_PREDICTION:
-            rec_residual = np.matmul(
-                np.matmul(dst_vii_inverse_matrix, block.reconstruction), dst_vii_matrix
-            )
-        elif prediction_mode == PredictionMode.DC_PREDICTION:
-            rec_residual = idct(
-                idct(block.reconstruction, axis=0, norm="ortho"), axis=1, norm="ortho"
-            )
-        elif prediction_mode == PredictionMode.HORIZONTAL_PREDICTION:
-            rec_residual = np.matmul(
-                idct(block.reconstruction, axis=0, norm="ortho"), dst_vii_matrix
-            )
-        else:
-            rec_residual = idct(
-                np.matmul(dst_vii_inverse_matrix, block.reconstruction),
-                axis=1,
-                norm="ortho",
-            )
-
-        return np.rint(rec_residual).astype(int)
+        return self.transform_backward_batch(
+            block.reconstruction[np.newaxis], [prediction_mode]
+        )[0]
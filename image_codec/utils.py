@@ -1,39 +1,16 @@
 import numpy as np
 
+from .scan_order import scan_order
 
-def sort_diagonal(block: np.ndarray) -> np.ndarray:
-    sorted_block = []
-    rows, columns = block.shape
-
-    for line in range(1, rows + columns):
-        start_column = max(0, line - rows)
-        count = min(line, (columns - start_column), rows)
-        for j in range(0, count):
-            sorted_block.append(block[min(rows, line) - j - 1][start_column + j])
 
-    return np.array(sorted_block)
+def sort_diagonal(block: np.ndarray) -> np.ndarray:
+    forward, _ = scan_order("diagonal", block.shape[0])
+    return block.ravel()[forward]
 
 
 def invert_diagonal_sort(block: np.ndarray) -> np.ndarray:
-    x = 0
-    y = 0
-    x_start = 0
-
-    height = block.shape[0]
-    sorted_block = np.zeros(block.shape, dtype=block.dtype)
-    block = block.flatten()
-
-    for index in range(block.size):
-        sorted_block[y][x] = block[index]
-        x += 1
-        y -= 1
-        if y < 0 or x >= height:
-            y = min(x, height - 1)
-            if x >= height:
-                x_start += 1
-            x = x_start
-
-    return sorted_block
+    _, inverse = scan_order("diagonal", block.shape[0])
+    return block.ravel()[inverse].reshape(block.shape)
 
 
 def count_bits(bit_pattern: int) -> int:
@@ -0,0 +1,122 @@
+import multiprocessing
+import numpy as np
+
+from typing import Callable, Optional
+
+from .context_modeler import ContextModeler
+from .shared_array import SharedArray
+
+
+class Wavefront:
+
+    LAG = 2
+
+    def __init__(self, n_rows: int, n_columns: int, shared: bool = False):
+        self.n_rows = n_rows
+        self.n_columns = n_columns
+        self.lag = min(self.LAG, n_columns)
+        self.condition = multiprocessing.Condition() if shared else None
+        self.shared_progress = SharedArray((n_rows + 1,), np.int64) if shared else None
+        self.shared_snapshot_flags = (
+            SharedArray((n_rows,), np.uint8) if shared else None
+        )
+        self.shared_snapshots = (
+            SharedArray((n_rows, ContextModeler.N_CONTEXTS), np.uint8)
+            if shared
+            else None
+        )
+        self.attach()
+
+        self.progress[...] = 0
+        self.snapshot_flags[...] = 0
+
+    def attach(self):
+        if self.condition is None:
+            self.progress = np.zeros(self.n_rows + 1, dtype=np.int64)
+            self.snapshot_flags = np.zeros(self.n_rows, dtype=np.uint8)
+            self.snapshots = np.zeros(
+                [self.n_rows, ContextModeler.N_CONTEXTS], dtype=np.uint8
+            )
+        else:
+            self.progress = self.shared_progress.array
+            self.snapshot_flags = self.shared_snapshot_flags.array
+            self.snapshots = self.shared_snapshots.array
+
+    def is_ready(self, row: int, column: int) -> bool:
+        return (
+            row == 0
+            or self.progress[row - 1] >= min(column + self.lag, self.n_columns)
+            or self.progress[self.n_rows] != 0
+        )
+
+    def is_snapshot_ready(self, row: int) -> bool:
+        return (
+            row == 0
+            or self.snapshot_flags[row - 1] != 0
+            or self.progress[self.n_rows] != 0
+        )
+
+    def wait(self, row: int, column: int):
+        self.wait_for(lambda: self.is_ready(row, column))
+
+    def wait_snapshot(self, row: int):
+        self.wait_for(lambda: self.is_snapshot_ready(row))
+
+    def wait_for(self, predicate: Callable[[], bool]):
+        if not predicate():
+            if self.condition is None:
+                raise Exception("Wavefront: Row above is not processed yet.")
+            with self.condition:
+                self.condition.wait_for(predicate)
+
+        if self.progress[self.n_rows] != 0:
+            raise Exception("Wavefront: Another row failed.")
+
+    def advance(self, row: int, column: int, context_modeler: ContextModeler):
+        self.save_snapshot(row, column, context_modeler)
+        self.update(row, column + 1)
+
+    def save_snapshot(self, row: int, column: int, context_modeler: ContextModeler):
+        if column + 1 == self.lag:
+            self.snapshots[row] = np.frombuffer(context_modeler.states, np.uint8)
+            self.publish(self.snapshot_flags, row, 1)
+
+    def fail(self):
+        self.update(self.n_rows, 1)
+
+    def update(self, index: int, value: int):
+        self.publish(self.progress, index, value)
+
+    def publish(self, array: np.ndarray, index: int, value: int):
+        if self.condition is None:
+            array[index] = value
+            return
+
+        with self.condition:
+            array[index] = value
+            self.condition.notify_all()
+
+    def inherited_snapshot(self, row: int) -> Optional[bytes]:
+        return self.snapshots[row - 1].tobytes() if row > 0 else None
+
+    def close(self):
+        if self.condition is not None:
+            self.progress = self.snapshot_flags = self.snapshots = None
+            self.shared_progress.close()
+            self.shared_snapshot_flags.close()
+            self.shared_snapshots.close()
+
+    def __enter__(self) -> "wavefront.Wavefront":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["progress"], state["snapshot_flags"], state["snapshots"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.attach()
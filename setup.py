@@ -7,10 +7,11 @@ install_requires = [
     "numpy",
     "typing",
     "dataclasses",
-    "scipy",
 ]
 
-development_requires = ["black", "pytest"]
+development_requires = ["black", "pytest", "scipy"]
+
+progress_requires = ["tqdm"]
 
 setup(
     name="image-codec",
@@ -24,7 +25,10 @@ setup(
     packages=find_packages(include=["image_codec*"]),
     python_requires=">=3.8",
     install_requires=install_requires,
-    extras_require={"development": development_requires},
+    extras_require={
+        "development": development_requires,
+        "progress": progress_requires,
+    },
     entry_points={
         "console_scripts": [
             "image-codec = image_codec.__main__:main",
@@ -0,0 +1,13 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="session")
+def synthetic_image():
+    def synthetic_image(width: int, height: int, seed: int = 0) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        y, x = np.mgrid[0:height, 0:width]
+        image = 128 + 60 * np.sin(x / 7) * np.cos(y / 11) + rng.normal(0, 6, x.shape)
+        return np.clip(image, 0, 255).astype(np.uint8)
+
+    return synthetic_image
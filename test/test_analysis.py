@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from image_codec.analysis import Analysis
+from image_codec.api import encode_array
+from image_codec.block import Block
+
+BLOCK_SIZE = 8
+QUALITY_PARAMETER = 12
+
+
+@pytest.fixture(scope="module")
+def image(synthetic_image):
+    return synthetic_image(48, 40)
+
+
+@pytest.fixture(scope="module")
+def recorded(image, tmp_path_factory):
+    path = tmp_path_factory.mktemp("analysis") / "image.analysis"
+    data = encode_array(
+        image, BLOCK_SIZE, QUALITY_PARAMETER, analysis_out_path=str(path)
+    )
+    return data, path
+
+
+def test_sidecar_round_trip(recorded):
+    data, path = recorded
+    analysis = Analysis.load(path)
+
+    assert analysis.block_size == BLOCK_SIZE
+    assert analysis.quality_parameter == QUALITY_PARAMETER
+    assert analysis.partitioning_modes.shape == (5, 6)
+    assert (analysis.partitioning_modes != Analysis.UNKNOWN_MODE).all()
+    assert path.stat().st_size < len(data) / 4
+
+
+def test_decision_below_refine_margin_is_searched_again():
+    analysis = Analysis.empty(BLOCK_SIZE, QUALITY_PARAMETER, 1, 2)
+    block = Block(8, 0, BLOCK_SIZE, np.zeros((BLOCK_SIZE, BLOCK_SIZE)))
+    assert analysis.decision(block) is None
+
+    analysis.partitioning_modes[0, 1] = 0
+    analysis.prediction_modes[0, 1, 0] = 3
+    analysis.margins[0, 1] = analysis.quantize_margins(0.05)
+    assert analysis.decision(block) == (0, [3])
+    assert analysis.decision(block, 0.05) == (0, [3])
+    assert analysis.decision(block, 0.06) is None
+
+
+def test_replay_reproduces_search(image, recorded):
+    data, path = recorded
+    assert data == encode_array(
+        image, BLOCK_SIZE, QUALITY_PARAMETER, analysis_in_path=str(path)
+    )
+
+
+def test_refining_all_blocks_matches_full_search(image, recorded):
+    _, path = recorded
+    assert encode_array(image, BLOCK_SIZE, QUALITY_PARAMETER + 4) == encode_array(
+        image,
+        BLOCK_SIZE,
+        QUALITY_PARAMETER + 4,
+        analysis_in_path=str(path),
+        refine_margin=Analysis.MAX_MARGIN,
+    )
+
+
+def test_replay_at_other_quality_parameter_keeps_decisions(image, recorded, tmp_path):
+    _, path = recorded
+    encode_array(
+        image,
+        BLOCK_SIZE,
+        QUALITY_PARAMETER + 4,
+        analysis_in_path=str(path),
+        analysis_out_path=str(tmp_path / "replayed.analysis"),
+    )
+    analysis = Analysis.load(path)
+    replayed = Analysis.load(tmp_path / "replayed.analysis")
+
+    np.testing.assert_array_equal(
+        replayed.partitioning_modes, analysis.partitioning_modes
+    )
+    np.testing.assert_array_equal(replayed.prediction_modes, analysis.prediction_modes)
+    np.testing.assert_array_equal(replayed.margins, analysis.margins)
+
+
+def test_invalid_sidecar_is_rejected(tmp_path):
+    (tmp_path / "image.analysis").write_bytes(b"\x00\x08\x0c\x00\x01\x00\x01garbage")
+    with pytest.raises(Exception, match="Invalid sidecar file"):
+        Analysis.load(tmp_path / "image.analysis")
@@ -0,0 +1,38 @@
+import io
+import numpy as np
+import pytest
+
+from image_codec.api import decode_bytes, encode_array, encode_file
+from image_codec.pgm import write_pgm
+
+
+@pytest.fixture
+def image():
+    return np.arange(32 * 48, dtype=np.uint8).reshape(32, 48)
+
+
+def test_array_round_trip(image):
+    decoded = decode_bytes(encode_array(image, 8, 0))
+    assert decoded.shape == image.shape
+    assert np.abs(decoded.astype(int) - image).max() <= 2
+
+
+@pytest.mark.parametrize("quality_parameter", [-1, 32, 99])
+def test_encode_array_rejects_quality_parameter(image, quality_parameter):
+    with pytest.raises(Exception, match="Quality parameter must be in range 0,31"):
+        encode_array(image, 8, quality_parameter)
+
+
+def test_encode_file_rejects_quality_parameter(image, tmp_path):
+    write_pgm(tmp_path / "image.pgm", image)
+    output = io.BytesIO()
+    with pytest.raises(Exception, match="must be integers"):
+        encode_file(tmp_path / "image.pgm", output, 8, 12.5)
+    assert output.getvalue() == b""
+
+
+def test_encode_file_is_quiet_by_default(image, tmp_path, capsys):
+    write_pgm(tmp_path / "image.pgm", image)
+    encode_file(tmp_path / "image.pgm", io.BytesIO(), 8, 12)
+
+    assert capsys.readouterr().err == ""
@@ -0,0 +1,37 @@
+import numpy as np
+import os
+
+from image_codec.batch import MANIFEST_NAME, encode_batch
+from image_codec.pgm import write_pgm
+
+
+def test_changed_options_are_encoded_again(tmp_path):
+    input_directory = tmp_path / "images"
+    output_directory = tmp_path / "bitstreams"
+    os.makedirs(input_directory / "nested")
+    for path in [input_directory / "a.pgm", input_directory / "nested" / "b.pgm"]:
+        write_pgm(path, np.arange(16 * 24, dtype=np.uint8).reshape(16, 24))
+
+    summary = encode_batch(
+        input_directory, output_directory, block_size=8, quality_parameter=4
+    )
+    assert (summary.n_files, summary.n_skipped) == (2, 0)
+    assert os.path.exists(output_directory / MANIFEST_NAME)
+    n_bytes = os.path.getsize(output_directory / "a.bin")
+
+    summary = encode_batch(
+        input_directory, output_directory, block_size=8, quality_parameter=4
+    )
+    assert (summary.n_files, summary.n_skipped) == (0, 2)
+
+    summary = encode_batch(
+        input_directory, output_directory, block_size=8, quality_parameter=24
+    )
+    assert (summary.n_files, summary.n_skipped) == (2, 0)
+    assert os.path.getsize(output_directory / "a.bin") < n_bytes
+
+    os.remove(output_directory / MANIFEST_NAME)
+    summary = encode_batch(
+        input_directory, output_directory, block_size=8, quality_parameter=24
+    )
+    assert (summary.n_files, summary.n_skipped) == (2, 0)
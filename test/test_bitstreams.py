@@ -0,0 +1,37 @@
+import io
+
+from image_codec.bitstreams.input import InputBitstream
+from image_codec.bitstreams.output import OutputBitstream
+
+
+class Sink(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.n_flushes = 0
+
+    def flush(self):
+        self.n_flushes += 1
+        super().flush()
+
+
+def test_terminate_flushes_sink():
+    sink = Sink()
+    output_bitstream = OutputBitstream(sink)
+    output_bitstream.write_bits(0b101, 3)
+    output_bitstream.write_byte(0xAB)
+    output_bitstream.terminate()
+
+    assert sink.n_flushes >= 1
+    assert sink.getvalue() == bytes([0b10110101, 0b01100000])
+
+
+def test_round_trip():
+    sink = io.BytesIO()
+    output_bitstream = OutputBitstream(sink)
+    output_bitstream.write_bits(0x1234, 16)
+    output_bitstream.write_bit(1)
+    output_bitstream.terminate()
+
+    input_bitstream = InputBitstream(sink.getvalue())
+    assert input_bitstream.read_bits(16) == 0x1234
+    assert input_bitstream.read_bit() == 1
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from image_codec.api import encode_array
+from image_codec.encoders.entropy import EntropyEncoder
+from image_codec.modes import EstimationMode
+
+BLOCK_SIZE = 16
+MEAN_RELATIVE_ERROR = 0.05
+MAX_RELATIVE_ERROR = 0.25
+TOTAL_RELATIVE_ERROR = 0.02
+
+
+@pytest.fixture(scope="module")
+def coded_blocks(synthetic_image):
+    image = synthetic_image(128, 128)
+
+    coded_blocks = []
+    encode_block = EntropyEncoder.encode_block
+
+    def record_block(entropy_encoder, parameters):
+        coded_blocks.append(parameters)
+        encode_block(entropy_encoder, parameters)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(EntropyEncoder, "encode_block", record_block)
+        n_bytes = len(encode_array(image, BLOCK_SIZE, 12))
+
+    return coded_blocks, n_bytes
+
+
+def estimate_bits(coded_blocks, estimation_mode):
+    entropy_encoder = EntropyEncoder(None, BLOCK_SIZE, estimation_mode)
+    estimations = []
+    for parameters in coded_blocks:
+        for index, prediction_mode_parameters in enumerate(
+            parameters.prediction_mode_parameters_list
+        ):
+            estimations.append(
+                entropy_encoder.estimate_block_bits(
+                    prediction_mode_parameters.block,
+                    parameters.partitioning_mode,
+                    prediction_mode_parameters.prediction_mode,
+                    is_first_partition=index == 0,
+                )
+            )
+        entropy_encoder.encode_block(parameters)
+    return np.array(estimations)
+
+
+def test_fast_estimate_is_close_to_exact_estimate(coded_blocks):
+    coded_blocks, _ = coded_blocks
+    exact_bits = estimate_bits(coded_blocks, EstimationMode.EXACT)
+    fast_bits = estimate_bits(coded_blocks, EstimationMode.FAST)
+
+    relevant = exact_bits >= 8
+    relative_errors = np.abs(fast_bits - exact_bits)[relevant] / exact_bits[relevant]
+    assert relative_errors.mean() < MEAN_RELATIVE_ERROR
+    assert relative_errors.max() < MAX_RELATIVE_ERROR
+    assert abs(fast_bits.sum() / exact_bits.sum() - 1) < TOTAL_RELATIVE_ERROR
+
+
+def test_exact_estimate_matches_coded_size(coded_blocks):
+    coded_blocks, n_bytes = coded_blocks
+    exact_bits = estimate_bits(coded_blocks, EstimationMode.EXACT)
+
+    assert abs(exact_bits.sum() / (8 * n_bytes) - 1) < TOTAL_RELATIVE_ERROR
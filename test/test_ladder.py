@@ -0,0 +1,36 @@
+import numpy as np
+import os
+import pytest
+
+from image_codec.encoders.ladder import encode_ladder, ladder_path
+from image_codec.pgm import write_pgm
+
+
+@pytest.mark.parametrize(
+    "path, expected_path",
+    [
+        ("out_{qp}.bin", "out_12.bin"),
+        ("{name}/{qp}/{0}.bin", "{name}/12/{0}.bin"),
+        ("out.bin", "out_qp12.bin"),
+        ("out{}.bin", "out{}_qp12.bin"),
+    ],
+)
+def test_ladder_path(path, expected_path):
+    assert ladder_path(path, 12) == expected_path
+
+
+def test_repeated_quality_parameters_are_encoded_once(tmp_path):
+    input_path = tmp_path / "image.pgm"
+    write_pgm(input_path, np.full([16, 16], 128, dtype=np.uint8))
+
+    output_paths = encode_ladder(
+        input_path,
+        str(tmp_path / "out_{qp}.bin"),
+        8,
+        [12, 8, 12],
+        preset="ultrafast",
+        show_progress=False,
+    )
+
+    assert output_paths == [str(tmp_path / "out_12.bin"), str(tmp_path / "out_8.bin")]
+    assert all(os.path.exists(output_path) for output_path in output_paths)
@@ -0,0 +1,44 @@
+import io
+import pytest
+
+from image_codec.bitstreams.input import InputBitstream
+from image_codec.bitstreams.output import OutputBitstream
+from image_codec.parameters import MetaParameters
+
+
+def test_header_round_trip():
+    meta_parameters = MetaParameters(
+        384, 512, 16, 31, n_tile_columns=3, n_tile_rows=2, substream_sizes=[1] * 6
+    )
+    output = io.BytesIO()
+    output_bitstream = OutputBitstream(output)
+    meta_parameters.encode(output_bitstream)
+    output_bitstream.terminate()
+
+    decoded = MetaParameters.decode(InputBitstream(output.getvalue()))
+    assert (decoded.height, decoded.width, decoded.block_size) == (384, 512, 16)
+    assert decoded.quality_parameter == 31
+    assert (decoded.n_tile_columns, decoded.n_tile_rows) == (3, 2)
+    assert decoded.substream_sizes == [1] * 6
+
+
+@pytest.mark.parametrize("quality_parameter", [-1, 32, 99])
+def test_quality_parameter_out_of_range(quality_parameter):
+    with pytest.raises(Exception, match="Quality parameter must be in range 0,31"):
+        MetaParameters(64, 64, 16, quality_parameter)
+
+
+@pytest.mark.parametrize(
+    "height, width, block_size", [(0, 64, 16), (64, 1 << 16, 16), (64, 64, 0)]
+)
+def test_sizes_out_of_range(height, width, block_size):
+    with pytest.raises(Exception, match="must be in range 1,65535"):
+        MetaParameters(height, width, block_size, 12)
+
+
+@pytest.mark.parametrize(
+    "block_size, quality_parameter", [(16, 12.5), (16, "12"), (16, None), (16.0, 12)]
+)
+def test_non_integer_parameters(block_size, quality_parameter):
+    with pytest.raises(Exception, match="must be integers"):
+        MetaParameters(64, 64, block_size, quality_parameter)
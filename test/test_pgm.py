@@ -0,0 +1,49 @@
+import io
+import numpy as np
+import pytest
+
+from image_codec.frame import Frame
+from image_codec.pgm import read_pgm, write_pgm
+
+
+def test_ascii_raster():
+    data, max_value = read_pgm(io.BytesIO(b"P2\n3 2\n255\n0 1 2\n3 4 255\n"))
+    assert max_value == 255
+    assert data.tolist() == [[0, 1, 2], [3, 4, 255]]
+
+
+@pytest.mark.parametrize(
+    "raster", [b"0 1 2\n3 4\n", b"0 1 2\n3 x 5\n", b"0 1 2\n3 -4 5\n"]
+)
+def test_corrupted_ascii_raster(raster):
+    with pytest.raises(Exception, match="PGM: PGM image is corrupted."):
+        read_pgm(io.BytesIO(b"P2\n3 2\n255\n" + raster))
+
+
+def test_binary_round_trip():
+    data = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    buffer = io.BytesIO()
+    write_pgm(buffer, data)
+    buffer.seek(0)
+    assert np.array_equal(read_pgm(buffer)[0], data)
+
+
+def test_frame_rejects_other_bit_depths(tmp_path):
+    path = tmp_path / "image.pgm"
+    write_pgm(path, np.zeros([2, 2], dtype=np.uint8), max_value=15)
+    with pytest.raises(Exception, match="unexpected bit depth"):
+        Frame.load(path, 8)
+
+
+@pytest.mark.parametrize("magic_number", [b"GIF89a", b"P5\n"])
+def test_file_without_header_is_rejected(tmp_path, magic_number):
+    path = tmp_path / "image.pgm"
+    path.write_bytes(magic_number + b" " * (1 << 20))
+    with pytest.raises(Exception, match="Not an PGM image"):
+        read_pgm(path)
+
+
+def test_header_comment_spans_chunks(tmp_path):
+    path = tmp_path / "image.pgm"
+    path.write_bytes(b"P5\n#" + b"x" * 10000 + b"\n2 1\n255\n\x07\x09")
+    assert read_pgm(path)[0].tolist() == [[7, 9]]
@@ -0,0 +1,68 @@
+import pytest
+
+from click.testing import CliRunner
+
+from image_codec.__main__ import main
+from image_codec.api import encode_array
+from image_codec.encoders.rate_control import RateController
+from image_codec.frame import Frame
+from image_codec.pgm import write_pgm
+from image_codec.presets import PRESETS
+
+BLOCK_SIZE = 8
+QUALITY_PARAMETERS = [16, 8, 12]
+RELATIVE_ERROR = 0.03
+
+
+@pytest.fixture(scope="module")
+def image(synthetic_image):
+    return synthetic_image(128, 96)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"wavefront": True}, {"n_tile_columns": 2, "n_tile_rows": 2}],
+)
+def test_estimate_is_close_to_coded_size(image, options):
+    rate_controller = RateController(
+        Frame(image, BLOCK_SIZE), PRESETS["fast"], **options
+    )
+    for quality_parameter in QUALITY_PARAMETERS:
+        n_bytes = len(
+            encode_array(image, BLOCK_SIZE, quality_parameter, preset="fast", **options)
+        )
+        assert rate_controller.estimate_bytes(quality_parameter) == pytest.approx(
+            n_bytes, rel=RELATIVE_ERROR
+        )
+
+
+def test_probes_replay_nearest_analysis(image):
+    rate_controller = RateController(Frame(image, BLOCK_SIZE), PRESETS["fast"])
+    assert rate_controller.nearest_analysis(12) is None
+
+    for quality_parameter in QUALITY_PARAMETERS:
+        rate_controller.estimate_bytes(quality_parameter)
+
+    assert sorted(rate_controller.analyses) == sorted(QUALITY_PARAMETERS)
+    assert rate_controller.nearest_analysis(14).quality_parameter in (12, 16)
+    assert rate_controller.nearest_analysis(9).quality_parameter == 8
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["-qp", "8", "-tb", "1000"],
+        ["-qpl", "4,8", "-tbpp", "1"],
+        ["-tb", "1", "-tbpp", "1"],
+    ],
+)
+def test_conflicting_rate_options_are_rejected(image, options, tmp_path):
+    write_pgm(tmp_path / "image.pgm", image)
+    result = CliRunner().invoke(
+        main,
+        ["encode", str(tmp_path / "image.pgm"), str(tmp_path / "image.bin")] + options,
+    )
+
+    assert result.exit_code == 2
+    assert "cannot be combined" in result.output
+    assert not (tmp_path / "image.bin").exists()
@@ -0,0 +1,74 @@
+import io
+import numpy as np
+import pytest
+import struct
+
+from image_codec.pgm import write_pgm
+from image_codec.server import PREFIX_FORMAT, Server, read_message, write_message
+
+
+@pytest.fixture(scope="module")
+def pgm_bytes():
+    output = io.BytesIO()
+    write_pgm(output, np.arange(16 * 24, dtype=np.uint8).reshape(16, 24))
+    return output.getvalue()
+
+
+def serve(n_jobs, requests):
+    input_file = io.BytesIO()
+    for request in requests:
+        if isinstance(request, bytes):
+            input_file.write(request)
+        else:
+            write_message(input_file, *request)
+    input_file.seek(0)
+
+    output_file = io.BytesIO()
+    with Server(n_jobs) as server:
+        server.serve_stream(input_file, output_file)
+    output_file.seek(0)
+
+    responses = []
+    response = read_message(output_file)
+    while response is not None:
+        responses.append(response)
+        response = read_message(output_file)
+    return responses
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_malformed_header_is_answered(pgm_bytes, n_jobs):
+    malformed_header = b"{not json"
+    responses = serve(
+        n_jobs,
+        [
+            struct.pack(PREFIX_FORMAT, len(malformed_header), 0) + malformed_header,
+            ({"command": "encode", "block_size": 8, "quality_parameter": 4}, pgm_bytes),
+            ({"command": "encode", "quality_parameter": 99}, pgm_bytes),
+            (
+                {"command": "encode", "block_size": 8, "quality_parameter": 20},
+                pgm_bytes,
+            ),
+        ],
+    )
+
+    assert [header["status"] for header, _ in responses] == [
+        "error",
+        "ok",
+        "error",
+        "ok",
+    ]
+    assert "not valid JSON" in responses[0][0]["message"]
+    assert len(responses[1][1]) > len(responses[3][1])
+
+
+def test_responses_keep_request_order(pgm_bytes):
+    quality_parameters = [0, 31, 4, 24, 8]
+    requests = [
+        ({"command": "encode", "block_size": 8, "quality_parameter": qp}, pgm_bytes)
+        for qp in quality_parameters
+    ]
+
+    assert [body for _, body in serve(2, requests)] == [
+        body for _, body in serve(1, requests)
+    ]
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+import image_codec
+
+HEAVY_MODULES = {"numpy", "scipy", "tqdm"}
+
+
+def test_help_does_not_import_heavy_modules():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "image_codec", "--help"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(image_codec.__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    imported_modules = {
+        line.rsplit("|", 1)[-1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "image_codec" in imported_modules
+    assert not imported_modules & HEAVY_MODULES
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from click.testing import CliRunner
+
+from image_codec.__main__ import main
+from image_codec.api import decode_bytes, decode_file, encode_array
+from image_codec.pgm import read_pgm, write_pgm
+
+BLOCK_SIZE = 8
+QUALITY_PARAMETER = 12
+LAYOUTS = [{}, {"n_tile_columns": 3, "n_tile_rows": 2}, {"wavefront": True}]
+
+
+@pytest.fixture(scope="module")
+def image(synthetic_image):
+    return synthetic_image(64, 64)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_decoder_matches_encoder_reconstruction(image, layout, tmp_path):
+    data = encode_array(
+        image,
+        BLOCK_SIZE,
+        QUALITY_PARAMETER,
+        reconstruction_path=tmp_path / "reconstruction.pgm",
+        **layout,
+    )
+    reconstruction, _ = read_pgm(tmp_path / "reconstruction.pgm")
+
+    np.testing.assert_array_equal(decode_bytes(data), reconstruction)
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [
+        (["-tc", "100"], "Tile grid is finer than the block grid"),
+        (["-wpp", "-tc", "2"], "cannot be combined with tiles"),
+    ],
+)
+def test_invalid_layout_is_reported_as_cli_error(image, options, message, tmp_path):
+    write_pgm(tmp_path / "image.pgm", image)
+    result = CliRunner().invoke(
+        main,
+        ["encode", str(tmp_path / "image.pgm"), str(tmp_path / "image.bin")]
+        + ["-bs", str(BLOCK_SIZE), "--no-progress"]
+        + options,
+    )
+
+    assert isinstance(result.exception, SystemExit)
+    assert result.exit_code == 1
+    assert "Error: " in result.output and message in result.output
+
+
+@pytest.mark.parametrize("layout", LAYOUTS[1:])
+def test_encoded_stream_does_not_depend_on_jobs(image, layout):
+    assert encode_array(
+        image, BLOCK_SIZE, QUALITY_PARAMETER, n_jobs=2, **layout
+    ) == encode_array(image, BLOCK_SIZE, QUALITY_PARAMETER, n_jobs=1, **layout)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS[1:])
+def test_parallel_decoding_matches_sequential_decoding(image, layout, tmp_path):
+    data = encode_array(image, BLOCK_SIZE, QUALITY_PARAMETER, **layout)
+    (tmp_path / "image.bin").write_bytes(data)
+    decode_file(tmp_path / "image.bin", tmp_path / "decoded.pgm", n_jobs=2)
+
+    np.testing.assert_array_equal(
+        read_pgm(tmp_path / "decoded.pgm")[0], decode_bytes(data)
+    )
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+@pytest.mark.parametrize("region", [(0, 0, 64, 64), (13, 21, 30, 17), (60, 3, 4, 1)])
+def test_region_matches_full_decoding(image, layout, region):
+    data = encode_array(image, BLOCK_SIZE, QUALITY_PARAMETER, **layout)
+    x, y, width, height = region
+
+    np.testing.assert_array_equal(
+        decode_bytes(data, region), decode_bytes(data)[y : y + height, x : x + width]
+    )
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from image_codec.modes import PredictionMode
+from image_codec.transformer import Transformer
+
+PREDICTION_MODES = list(PredictionMode)
+
+
+def residuals(block_size: int, n_blocks: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(-255, 256, [n_blocks, block_size, block_size])
+
+
+@pytest.mark.parametrize("block_size", [4, 8, 16])
+def test_batch_matches_single_transforms(block_size):
+    transformer = Transformer()
+    prediction_errors = residuals(block_size, len(PREDICTION_MODES))
+
+    coefficients = transformer.transform_forward_batch(
+        prediction_errors, PREDICTION_MODES
+    )
+    reconstructions = transformer.transform_backward_batch(
+        coefficients, PREDICTION_MODES
+    )
+
+    for index, prediction_mode in enumerate(PREDICTION_MODES):
+        single_coefficients = transformer.transform_forward_batch(
+            prediction_errors[index : index + 1], [prediction_mode]
+        )[0]
+        assert np.allclose(coefficients[index], single_coefficients)
+        assert np.array_equal(
+            reconstructions[index],
+            transformer.transform_backward_batch(
+                single_coefficients[np.newaxis], [prediction_mode]
+            )[0],
+        )
+
+    assert np.array_equal(reconstructions, prediction_errors)
+
+
+def scipy_transform_forward(prediction_error, prediction_mode):
+    fftpack = pytest.importorskip("scipy.fftpack")
+    dst_vii_matrix = Transformer.generate_dst_vii_matrix(prediction_error.shape[0])
+
+    if prediction_mode == PredictionMode.PLANAR_PREDICTION:
+        return dst_vii_matrix @ prediction_error @ dst_vii_matrix.T
+    elif prediction_mode == PredictionMode.DC_PREDICTION:
+        return fftpack.dct(
+            fftpack.dct(prediction_error, axis=0, norm="ortho"), axis=1, norm="ortho"
+        )
+    elif prediction_mode == PredictionMode.HORIZONTAL_PREDICTION:
+        return fftpack.dct(prediction_error, axis=0, norm="ortho") @ dst_vii_matrix.T
+    else:
+        return fftpack.dct(dst_vii_matrix @ prediction_error, axis=1, norm="ortho")
+
+
+def scipy_transform_backward(reconstruction, prediction_mode):
+    fftpack = pytest.importorskip("scipy.fftpack")
+    dst_vii_matrix = Transformer.generate_dst_vii_matrix(reconstruction.shape[0])
+
+    if prediction_mode == PredictionMode.PLANAR_PREDICTION:
+        rec_residual = dst_vii_matrix.T @ reconstruction @ dst_vii_matrix
+    elif prediction_mode == PredictionMode.DC_PREDICTION:
+        rec_residual = fftpack.idct(
+            fftpack.idct(reconstruction, axis=0, norm="ortho"), axis=1, norm="ortho"
+        )
+    elif prediction_mode == PredictionMode.HORIZONTAL_PREDICTION:
+        rec_residual = (
+            fftpack.idct(reconstruction, axis=0, norm="ortho") @ dst_vii_matrix
+        )
+    else:
+        rec_residual = fftpack.idct(
+            dst_vii_matrix.T @ reconstruction, axis=1, norm="ortho"
+        )
+
+    return np.rint(rec_residual).astype(int)
+
+
+@pytest.mark.parametrize("block_size", [4, 8, 16])
+@pytest.mark.parametrize("prediction_mode", PREDICTION_MODES)
+def test_matches_scipy_transforms(block_size, prediction_mode):
+    transformer = Transformer()
+    prediction_errors = residuals(block_size, 64, seed=int(prediction_mode))
+
+    coefficients = transformer.transform_forward_batch(
+        prediction_errors, [prediction_mode] * len(prediction_errors)
+    )
+    for quantization_step_size in [1, 2 ** (12 / 4), 2 ** (24 / 4)]:
+        q_indexes = transformer.quantize(coefficients, quantization_step_size)
+        reconstructions = transformer.transform_backward_batch(
+            q_indexes * quantization_step_size,
+            [prediction_mode] * len(prediction_errors),
+        )
+
+        for index, prediction_error in enumerate(prediction_errors):
+            scipy_q_indexes = transformer.quantize(
+                scipy_transform_forward(prediction_error, prediction_mode),
+                quantization_step_size,
+            )
+            assert np.array_equal(q_indexes[index], scipy_q_indexes)
+            assert np.array_equal(
+                reconstructions[index],
+                scipy_transform_backward(
+                    scipy_q_indexes * quantization_step_size, prediction_mode
+                ),
+            )
+
+
+@pytest.mark.parametrize("block_size", [4, 6, 12, 16])
+def test_satd(block_size):
+    prediction_errors = residuals(block_size, 3)
+    satds = Transformer.satd(prediction_errors)
+
+    assert satds.shape == (3,)
+    assert np.all(satds > 0)
+    assert Transformer.satd(np.zeros([1, block_size, block_size]))[0] == 0
@@ -0,0 +1,33 @@
+import pytest
+
+from image_codec.context_modeler import ContextModeler
+from image_codec.wavefront import Wavefront
+
+
+def test_snapshot_is_ready_before_row_progress():
+    wavefront = Wavefront(2, 4)
+    context_modeler = ContextModeler(8)
+
+    with pytest.raises(Exception, match="Row above is not processed yet"):
+        wavefront.wait_snapshot(1)
+
+    wavefront.save_snapshot(0, 0, context_modeler)
+    with pytest.raises(Exception, match="Row above is not processed yet"):
+        wavefront.wait_snapshot(1)
+
+    wavefront.save_snapshot(0, 1, context_modeler)
+    wavefront.wait_snapshot(1)
+    assert wavefront.inherited_snapshot(1) == context_modeler.snapshot()
+    with pytest.raises(Exception, match="Row above is not processed yet"):
+        wavefront.wait(1, 0)
+
+    wavefront.update(0, 2)
+    wavefront.wait(1, 0)
+
+
+def test_failure_releases_waiting_rows():
+    wavefront = Wavefront(2, 4)
+    wavefront.fail()
+
+    with pytest.raises(Exception, match="Another row failed"):
+        wavefront.wait_snapshot(1)